@@ -1,14 +1,54 @@
+import logging
+
 from flask import Flask
 from flask_cors import CORS 
+from app.compression import init_compression
 from app.config import Config 
+from app.json_provider import JSON_PROVIDERS
 
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config) 
+    app.json = JSON_PROVIDERS[app.config['JSON_PROVIDER']](app)
     CORS(app) 
+    init_compression(app)
 
     from app.controllers.employee_controller import employee_bp
+    from app.controllers.metrics_controller import metrics_bp
     app.register_blueprint(employee_bp)
+    app.register_blueprint(metrics_bp)
     
-    return app
\ No newline at end of file
+    return app
+
+
+# create_app() не відкриває з'єднань і не запускає потоків, тому його можна
+# викликати в master-процесі до fork. Пул, кеш і пул фонових задач створюються
+# ліниво в кожному процесі; warm_up() заповнює їх одразу після fork воркера.
+def warm_up(app):
+    from app.dao.connection_pool import get_pool, get_replica_pools
+    from app.metrics import start_snapshot_writer
+    from app.services.employee_cache import get_employee_cache
+
+    for pool in [get_pool(app)] + get_replica_pools(app):
+        try:
+            pool.warm()
+        except Exception as e:
+            logging.getLogger(__name__).warning('DB pool warm-up failed: %s', e)
+    get_employee_cache(app)
+    start_snapshot_writer(app)
+
+
+def shutdown(app):
+    from app.metrics import registry, stop_snapshot_writer
+
+    if app.config['METRICS_MULTIPROC_DIR']:
+        stop_snapshot_writer(app)
+        registry.mark_dead(app.config['METRICS_MULTIPROC_DIR'])
+    pools = [app.extensions.get('mysql_pool')] + app.extensions.get('mysql_replica_pools', [])
+    for pool in pools:
+        if pool is not None:
+            pool.close()
+    runner = app.extensions.get('job_runner')
+    if runner is not None:
+        runner.shutdown(wait=False)
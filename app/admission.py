@@ -0,0 +1,163 @@
+# app/admission.py
+
+import heapq
+import itertools
+import os
+import threading
+import time
+
+from flask import current_app, g, jsonify, request
+
+
+class AdmissionRejected(Exception):
+
+    def __init__(self, reason, retry_after):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _Waiter:
+
+    def __init__(self, priority, seq):
+        self.priority = priority
+        self.seq = seq
+        self.state = 'waiting'   # waiting / granted / evicted / cancelled
+
+    def __lt__(self, other):
+        # Менше число — вищий пріоритет; серед рівних — FIFO
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class AdmissionGate:
+    # Обмежує кількість одночасних запитів до БД. Надлишкові запити чекають у
+    # черзі з пріоритетами; якщо черга повна або очікування задовге — 503.
+    # При повній черзі новий запит з вищим пріоритетом витісняє найгірший.
+
+    def __init__(self, max_concurrency, max_queue, queue_timeout, retry_after=1):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.pid = os.getpid()
+        self._cond = threading.Condition()
+        self._active = 0
+        self._queue = []
+        self._seq = itertools.count()
+        self._stats = {'admitted': 0, 'rejected_queue_full': 0, 'rejected_timeout': 0, 'evicted': 0}
+
+    def _queued(self):
+        return sum(1 for w in self._queue if w.state == 'waiting')
+
+    def _reject(self, reason, counter):
+        self._stats[counter] += 1
+        raise AdmissionRejected(reason, self.retry_after)
+
+    def acquire(self, priority):
+        with self._cond:
+            if self._active < self.max_concurrency and not self._queued():
+                self._active += 1
+                self._stats['admitted'] += 1
+                return
+
+            if self._queued() >= self.max_queue:
+                worst = max((w for w in self._queue if w.state == 'waiting'), default=None)
+                if worst is None or worst.priority <= priority:
+                    self._reject('Admission queue is full', 'rejected_queue_full')
+                worst.state = 'evicted'
+                self._stats['evicted'] += 1
+                self._cond.notify_all()
+
+            waiter = _Waiter(priority, next(self._seq))
+            heapq.heappush(self._queue, waiter)
+            deadline = time.monotonic() + self.queue_timeout
+            while waiter.state == 'waiting':
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    waiter.state = 'cancelled'
+                    self._reject('Timed out waiting for a database slot', 'rejected_timeout')
+                self._cond.wait(remaining)
+
+            if waiter.state == 'evicted':
+                self._reject('Admission queue is full', 'rejected_queue_full')
+            self._stats['admitted'] += 1
+
+    def release(self):
+        with self._cond:
+            self._active -= 1
+            while self._queue:
+                waiter = heapq.heappop(self._queue)
+                if waiter.state == 'waiting':
+                    waiter.state = 'granted'
+                    self._active += 1
+                    break
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            result = dict(self._stats)
+            waiting = [w for w in self._queue if w.state == 'waiting']
+            result.update({
+                'active': self._active,
+                'queued': len(waiting),
+                'queued_by_priority': {
+                    str(p): sum(1 for w in waiting if w.priority == p) for p in sorted({w.priority for w in waiting})
+                },
+                'max_concurrency': self.max_concurrency,
+                'max_queue': self.max_queue,
+            })
+            return result
+
+
+_registry_lock = threading.Lock()
+
+
+def get_admission_gate(app):
+    with _registry_lock:
+        gate = app.extensions.get('admission_gate')
+        if gate is None or gate.pid != os.getpid():
+            config = app.config
+            gate = AdmissionGate(
+                max_concurrency=config['ADMISSION_MAX_CONCURRENCY'],
+                max_queue=config['ADMISSION_MAX_QUEUE'],
+                queue_timeout=config['ADMISSION_QUEUE_TIMEOUT'],
+                retry_after=config['ADMISSION_RETRY_AFTER'],
+            )
+            app.extensions['admission_gate'] = gate
+        return gate
+
+
+# ----------------------------------------
+# Хуки для маршрутів
+# ----------------------------------------
+
+def _admit():
+    config = current_app.config
+    if not config['ADMISSION_ENABLED']:
+        return
+    priorities = config['ADMISSION_ROUTE_PRIORITIES']
+    priority = priorities.get(request.endpoint, config['ADMISSION_DEFAULT_PRIORITY'])
+    if priority is None:
+        return
+    get_admission_gate(current_app).acquire(priority)
+    g.admission_slot = True
+
+
+def _release(exc):
+    # teardown_request потокової відповіді виконується після її завершення,
+    # тож слот утримується, поки експорт читає з БД
+    if g.pop('admission_slot', False):
+        get_admission_gate(current_app).release()
+
+
+def _rejected(error):
+    response = jsonify({'message': f'Service overloaded: {error.reason}'})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+
+def init_admission(bp):
+    bp.before_request(_admit)
+    bp.teardown_request(_release)
+    bp.register_error_handler(AdmissionRejected, _rejected)
@@ -0,0 +1,91 @@
+# app/compression.py
+
+import zlib
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # brotli опціональний, без нього — лише gzip
+    brotli = None
+
+
+def _supported_encodings():
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+
+class _Compressor:
+
+    def __init__(self, encoding, config):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._obj = brotli.Compressor(quality=config['COMPRESS_BROTLI_QUALITY'])
+        else:
+            # wbits=31 — формат gzip (заголовок + CRC)
+            self._obj = zlib.compressobj(config['COMPRESS_LEVEL'], zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        if self.encoding == 'br':
+            return self._obj.process(data)
+        return self._obj.compress(data)
+
+    def finish(self):
+        if self.encoding == 'br':
+            return self._obj.finish()
+        return self._obj.flush()
+
+
+def _compress_stream(chunks, original, compressor):
+    # Стиснення по частинах: тіло потокової відповіді не буферизується
+    try:
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        tail = compressor.finish()
+        if tail:
+            yield tail
+    finally:
+        if hasattr(original, 'close'):
+            original.close()
+
+
+def _should_compress(response, config):
+    if response.status_code < 200 or response.status_code >= 300 or response.status_code == 204:
+        return False
+    if response.direct_passthrough or 'Content-Encoding' in response.headers:
+        return False
+    if response.mimetype not in config['COMPRESS_MIMETYPES']:
+        return False
+    if not response.is_streamed and (response.content_length or 0) < config['COMPRESS_MIN_SIZE']:
+        return False
+    return True
+
+
+def init_compression(app):
+
+    @app.after_request
+    def compress_response(response):
+        response.vary.add('Accept-Encoding')
+        config = app.config
+        if not _should_compress(response, config):
+            return response
+
+        encoding = request.accept_encodings.best_match(_supported_encodings())
+        if encoding is None:
+            return response
+
+        compressor = _Compressor(encoding, config)
+        if response.is_streamed:
+            response.response = _compress_stream(response.iter_encoded(), response.response, compressor)
+            response.headers.pop('Content-Length', None)
+        else:
+            response.set_data(compressor.compress(response.get_data()) + compressor.finish())
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            # Сильний ETag має відрізнятися для кожного кодування тіла
+            response.set_etag('{}-{}'.format(etag, encoding))
+        return response
+
+    return app
@@ -1,34 +1,172 @@
 # app/controllers/employee_controller.py (Виправлена версія)
 
-from flask import Blueprint, jsonify, request
-from app.services.employee_service import EmployeeService 
+import functools
+import json
+import zlib
+from datetime import datetime
+
+from flask import Blueprint, Response, current_app, g, jsonify, request, stream_with_context, url_for
+from app.admission import init_admission
+from app.metrics import instrument_blueprint
+from app.services.employee_service import EMPLOYEE_FIELD_COLUMNS, EmployeeService 
 
 employee_bp = Blueprint('employee', __name__, url_prefix='/api/employees')
+instrument_blueprint(employee_bp)
+init_admission(employee_bp)
 employee_service = EmployeeService()
 
 
+def conditional(*table_names, unless=None):
+    # Сильний ETag із лічильників версій таблиць (table_versions) + URL запиту.
+    # Якщо клієнт надіслав той самий If-None-Match — 304 без виконання запиту.
+    # unless() -> True — запит обробляється без ETag і без читання версій.
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if unless is not None and unless():
+                return view(*args, **kwargs)
+            versions = employee_service.get_table_versions(table_names)
+            # Версії, під якими видається тег: спільні результати (single-flight) ключуються ними,
+            # щоб тег версії N ніколи не опинився на тілі, обчисленому при N-1
+            g.etag_versions = tuple((t, versions.get(t, 0)) for t in table_names)
+            url_hash = zlib.crc32(request.full_path.encode('utf-8'))
+            etag = '{}-{:08x}'.format('.'.join(str(versions.get(t, 0)) for t in table_names), url_hash)
+
+            # Стиснена відповідь має ETag із суфіксом кодування (див. app/compression.py)
+            for tag in (etag, etag + '-gzip', etag + '-br'):
+                if request.if_none_match.contains(tag):
+                    response = Response(status=304)
+                    response.set_etag(tag)
+                    return response
+
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag)
+            return response
+        return wrapper
+    return decorator
+
+def _wants_columnar():
+    return request.args.get('format') == 'columnar'
+
+def _list_response(items):
+    # ?format=columnar: назви колонок один раз + масиви значень
+    if _wants_columnar():
+        return jsonify(employee_service.to_columnar(items))
+    return jsonify(items)
+
+
 # ----------------------------------------
 # I. EMPLOYEE CRUD ROUTES
 # ----------------------------------------
 
+def _is_cached_batch():
+    return 'ids' in request.args
+
+
+# ?ids= обслуговується з кешу працівників (у кожного воркера свій), тож тіло може бути
+# старішим за поточну версію таблиці — як і GET /<id>, цей шлях іде без ETag
 @employee_bp.route('/', methods=['GET'])
+@conditional('employees', unless=_is_cached_batch)
 def get_employees():
-    employees = employee_service.get_all_employees()
-    return jsonify(employees)
+    # ?ids=1,2,3 — пакетний пошук замість N окремих GET /<id>. Список обмежений
+    # EMPLOYEE_QUERY_MAX_IDS, щоб рядок запиту вмістився в limit_request_line gunicorn;
+    # більші пакети — POST /batch_get
+    if 'ids' in request.args:
+        try:
+            ids = [int(i) for i in request.args['ids'].split(',') if i.strip()]
+        except ValueError:
+            return jsonify({'message': 'ids must be a comma-separated list of integers'}), 400
+        return _employees_by_ids(ids, current_app.config['EMPLOYEE_QUERY_MAX_IDS'])
+
+    # Без параметрів пагінації — повний список (сумісність зі старими клієнтами)
+    if not any(k in request.args for k in ('after', 'limit', 'fields')):
+        if _wants_columnar():
+            return jsonify(employee_service.get_all_employees_columnar())
+        employees = employee_service.get_all_employees()
+        return jsonify(employees)
+
+    config = current_app.config
+    after_id = request.args.get('after', type=int)
+    limit = request.args.get('limit', config['EMPLOYEES_PAGE_DEFAULT_LIMIT'], type=int)
+    if limit < 1 or limit > config['EMPLOYEES_PAGE_MAX_LIMIT']:
+        return jsonify({'message': f'limit must be between 1 and {config["EMPLOYEES_PAGE_MAX_LIMIT"]}'}), 400
+
+    fields = None
+    if request.args.get('fields'):
+        fields = [f.strip() for f in request.args['fields'].split(',') if f.strip()]
+        unknown = [f for f in fields if f not in EMPLOYEE_FIELD_COLUMNS]
+        if unknown:
+            return jsonify({'message': f'Unknown fields: {", ".join(unknown)}'}), 400
+
+    page = employee_service.get_employees_page(after_id, limit, fields)
+    if _wants_columnar():
+        page = dict(employee_service.to_columnar(page['items']), nextCursor=page['nextCursor'])
+    return jsonify(page)
+
+@employee_bp.route('/batch_get', methods=['POST'])
+def get_employees_batch_route():
+    # {"ids": [1, 2, 3]} — той самий пакетний пошук, що й ?ids=, для великих списків
+    data = request.get_json(silent=True)
+    ids = data.get('ids') if isinstance(data, dict) else None
+    if not isinstance(ids, list) or not all(type(i) is int for i in ids):
+        return jsonify({'message': 'Expected a JSON object with "ids": a list of integers'}), 400
+    return _employees_by_ids(ids, current_app.config['EMPLOYEE_BATCH_MAX_IDS'])
+
+def _employees_by_ids(ids, max_ids):
+    if not ids or len(ids) > max_ids:
+        return jsonify({'message': f'ids must contain between 1 and {max_ids} IDs'}), 400
+    return jsonify(employee_service.get_employees_by_ids(ids))
 
 @employee_bp.route('/', methods=['POST'])
 def create_employee():
     data = request.get_json()
     if not all(k in data for k in ('first_name', 'last_name', 'email', 'department_id')):
         return jsonify({'message': 'Missing required fields: name, email, department_id'}), 400
+    data, error = employee_service.validate_employee_data(data)
+    if error:
+        return jsonify({'message': error}), 400
         
     new_employee = employee_service.create_employee(data)
     if new_employee:
         return jsonify(new_employee), 201 
     return jsonify({'message': 'Error creating employee'}), 500
 
+@employee_bp.route('/changes', methods=['GET'])
+def get_employee_changes_route():
+    # Клієнт зберігає nextToken і передає його як since при наступному запиті
+    config = current_app.config
+    limit = request.args.get('limit', config['EMPLOYEE_CHANGES_DEFAULT_LIMIT'], type=int)
+    if limit < 1 or limit > config['EMPLOYEE_CHANGES_MAX_LIMIT']:
+        return jsonify({'message': f'limit must be between 1 and {config["EMPLOYEE_CHANGES_MAX_LIMIT"]}'}), 400
+    try:
+        employee_service.parse_changes_token(request.args.get('since'))
+    except ValueError:
+        return jsonify({'message': 'Invalid since token'}), 400
+    return jsonify(employee_service.get_employee_changes(request.args.get('since'), limit))
+
+@employee_bp.route('/bulk_import', methods=['POST'])
+def bulk_import_employees_route():
+    # JSON-масив або CSV (файл у полі "file" чи тіло text/csv)
+    if 'file' in request.files:
+        rows = employee_service.parse_import_csv(request.files['file'].read().decode('utf-8-sig'))
+    elif request.mimetype == 'text/csv':
+        rows = employee_service.parse_import_csv(request.get_data(as_text=True))
+    else:
+        rows = request.get_json(silent=True)
+        if not isinstance(rows, list):
+            return jsonify({'message': 'Expected a JSON array of employees or a CSV upload'}), 400
+
+    if len(rows) > current_app.config['EMPLOYEE_IMPORT_MAX_ROWS']:
+        return jsonify({'message': f'Too many rows (max {current_app.config["EMPLOYEE_IMPORT_MAX_ROWS"]})'}), 413
+
+    report = employee_service.import_employees(rows)
+    return jsonify(report), 201 if report['created'] else 400
+
 @employee_bp.route('/<int:employee_id>', methods=['GET'])
 def get_employee(employee_id):
+    # Без @conditional: запис зазвичай береться з кешу, а перевірка версії
+    # потребувала б звернення до БД на кожен GET
     employee = employee_service.get_employee_by_id(employee_id)
     if employee:
         return jsonify(employee)
@@ -37,13 +175,15 @@ def get_employee(employee_id):
 @employee_bp.route('/<int:employee_id>', methods=['PUT'])
 def update_employee(employee_id):
     data = request.get_json()
-    if not employee_service.get_employee_by_id(employee_id):
-         return jsonify({'message': 'Employee not found'}), 404
-         
     if not all(k in data for k in ('first_name', 'last_name', 'email', 'department_id', 'is_it_staff')):
          return jsonify({'message': 'Missing all required update fields'}), 400
+    data, error = employee_service.validate_employee_data(data)
+    if error:
+        return jsonify({'message': error}), 400
          
     updated_employee = employee_service.update_employee_data(employee_id, data)
+    if updated_employee is None:
+        return jsonify({'message': 'Employee not found'}), 404
     if updated_employee:
         return jsonify(updated_employee)
     return jsonify({'message': 'Update failed'}), 500
@@ -80,24 +220,43 @@ def delete_employee(employee_id):
 # ----------------------------------------
 
 @employee_bp.route('/departments/<int:department_id>', methods=['GET'])
+@conditional('employees', 'departments')
 def get_employees_by_department_route(department_id):
     employees = employee_service.get_employees_by_department_data(department_id)
     if employees:
-        return jsonify(employees)
+        return _list_response(employees)
     return jsonify({'message': f'No employees found for Department ID {department_id}'}), 404
 
+@employee_bp.route('/tickets/assignments', methods=['GET'])
+def get_assignments_for_tickets_route():
+    # ?ids=1,2,3&limit_per_ticket=N — призначення для багатьох заявок одним запитом
+    config = current_app.config
+    try:
+        ticket_ids = [int(i) for i in request.args.get('ids', '').split(',') if i.strip()]
+    except ValueError:
+        return jsonify({'message': 'ids must be a comma-separated list of integers'}), 400
+    if not ticket_ids or len(ticket_ids) > config['TICKET_ASSIGNMENTS_MAX_TICKETS']:
+        return jsonify({'message': f'ids must contain between 1 and {config["TICKET_ASSIGNMENTS_MAX_TICKETS"]} IDs'}), 400
+
+    per_ticket_limit = request.args.get('limit_per_ticket', config['TICKET_ASSIGNMENTS_DEFAULT_PER_TICKET'], type=int)
+    if per_ticket_limit < 1 or per_ticket_limit > config['TICKET_ASSIGNMENTS_MAX_PER_TICKET']:
+        return jsonify({'message': f'limit_per_ticket must be between 1 and {config["TICKET_ASSIGNMENTS_MAX_PER_TICKET"]}'}), 400
+
+    return jsonify(employee_service.get_assignments_for_tickets_data(ticket_ids, per_ticket_limit))
+
 @employee_bp.route('/tickets/<int:ticket_id>/assignments', methods=['GET'])
 def get_assignments_for_ticket_route(ticket_id):
     assignments = employee_service.get_assignments_for_ticket_data(ticket_id)
     if assignments:
-        return jsonify(assignments)
+        return _list_response(assignments)
     return jsonify({'message': f'No assignments found for Ticket ID {ticket_id}'}), 404
 
 @employee_bp.route('/equipment_by_type_report', methods=['GET'])
+@conditional('equipment', 'equipment_types')
 def get_equipment_report_route():
     report = employee_service.get_equipment_report()
     if report:
-        return jsonify(report)
+        return _list_response(report)
     return jsonify({'message': 'Equipment report is empty'}), 200
     
 # ----------------------------------------
@@ -167,19 +326,56 @@ def assign_ticket_route():
         'message': 'Помилка призначення заявки: не знайдено виконавця або заявку з таким заголовком'
     }), 404
 
+@employee_bp.route('/ticket_assignments/batch', methods=['POST'])
+def assign_tickets_batch_route():
+    # Тіло: масив призначень або {"assignments": [...]}
+    data = request.get_json(silent=True)
+    items = data.get('assignments') if isinstance(data, dict) else data
+    if not isinstance(items, list) or not items:
+        return jsonify({'message': 'Expected a non-empty list of assignments'}), 400
+    max_items = current_app.config['TICKET_ASSIGNMENT_BATCH_MAX']
+    if len(items) > max_items:
+        return jsonify({'message': f'Too many assignments (max {max_items})'}), 413
+
+    report = employee_service.assign_tickets_batch(items)
+    if report is None:
+        return jsonify({'message': 'Помилка пакетного призначення заявок'}), 500
+    return jsonify(report), 201 if report['assigned'] else 400
+
 # app/controllers/employee_controller.py (ДОДАТИ НОВИЙ МАРШРУТ)
 
 @employee_bp.route('/equipment_types/batch_insert', methods=['POST'])
 def batch_insert_equipment_types_route():
-    # Визначаємо стартовий ID. Поточні ID: 1, 2, 3. Починаємо з 4.
-    start_id = 4 
-    
-    rows = employee_service.batch_insert_equipment_types(start_id)
-    
-    if rows is not None:
-        return jsonify({
-            'message': f'Успішно додано {rows} нових типів обладнання (Noname {start_id} до Noname {start_id + rows - 1})'
-        }), 201
+    # {"names": ["Laptop", ...]} або {"count": 100, "prefix": "Noname", "start": 1}
+    # (назви "Noname 1" ... "Noname 100"). Наявні назви повертаються в "existing".
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'message': 'Expected a JSON object with "names" or "count"'}), 400
+
+    max_items = current_app.config['EQUIPMENT_TYPE_BATCH_MAX']
+    if 'names' in data:
+        names = data['names']
+        if not isinstance(names, list) or not all(isinstance(n, str) and n.strip() for n in names):
+            return jsonify({'message': 'names must be a list of non-empty strings'}), 400
+        names = [n.strip() for n in names]
+    else:
+        count, start = data.get('count'), data.get('start', 1)
+        prefix = str(data.get('prefix', 'Noname')).strip()
+        if type(count) is not int or count < 1 or type(start) is not int or not prefix:
+            return jsonify({'message': 'Expected "names" or a positive integer "count" with "prefix"'}), 400
+        if count > max_items:
+            return jsonify({'message': f'Too many equipment types (max {max_items})'}), 413
+        names = [f'{prefix} {i}' for i in range(start, start + count)]
+
+    if not names:
+        return jsonify({'message': 'names must not be empty'}), 400
+    if len(names) > max_items:
+        return jsonify({'message': f'Too many equipment types (max {max_items})'}), 413
+
+    result = employee_service.create_equipment_types_batch(names)
+    if result is not None:
+        result['message'] = f'Успішно додано {len(result["created"])} нових типів обладнання'
+        return jsonify(result), 201 if result['created'] else 200
     
     return jsonify({'message': 'Помилка пакетного створення типів обладнання'}), 500
 
@@ -198,15 +394,24 @@ def get_ticket_priority_stats_route():
 
 @employee_bp.route('/equipment/split_log', methods=['POST'])
 def split_equipment_log_route():
-    result = employee_service.split_equipment_log()
-    
-    if result and result['rows_moved'] is not None:
-        return jsonify({
-            'message': f'Успішно розподілено {result["rows_moved"]} записів обладнання.',
-            'createdTables': result['new_tables']
-        }), 201
-    
-    return jsonify({'message': 'Помилка виконання процедури розподілу даних'}), 500
+    # Процедура запускається у фоні; статус — GET /api/employees/jobs/<job_id>
+    job, created = employee_service.submit_split_equipment_log()
+    body = job.to_dict()
+    body['statusUrl'] = url_for('employee.get_job_route', job_id=job.id)
+
+    if not created:
+        body['message'] = 'Розподіл даних вже виконується'
+        return jsonify(body), 409
+
+    body['message'] = 'Розподіл даних обладнання поставлено в чергу'
+    return jsonify(body), 202
+
+@employee_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job_route(job_id):
+    job = employee_service.get_job(job_id)
+    if job:
+        return jsonify(job), 200
+    return jsonify({'message': 'Job not found'}), 404
 
 # app/controllers/employee_controller.py (ДОДАТИ НОВИЙ МАРШРУТ)
 
@@ -228,12 +433,147 @@ def delete_equipment_type_route(type_id):
 
 # app/controllers/employee_controller.py (ДОДАТИ НОВИЙ МАРШРУТ)
 
+DELETION_LOG_PAGE_PARAMS = ('before_log_id', 'after_log_id', 'since', 'until', 'limit')
+
 @employee_bp.route('/equipment_types/logs', methods=['GET'])
 def get_equipment_type_logs_route():
+    # Без параметрів пагінації — повний список (сумісність зі старими клієнтами).
+    # ?before_log_id= — старіші записи; ?after_log_id= — новіші за останній побачений (tail);
+    # ?since= / ?until= — ISO-час за deleted_at
+    if any(k in request.args for k in DELETION_LOG_PAGE_PARAMS):
+        return _equipment_type_logs_page()
+
     logs = employee_service.get_equipment_type_deletion_logs()
     
     if logs is not None:
-        return jsonify(logs), 200
+        return _list_response(logs), 200
     
     return jsonify({'message': 'Помилка отримання логів видалення'}), 500
 
+def _equipment_type_logs_page():
+    config = current_app.config
+    limit = request.args.get('limit', config['DELETION_LOG_PAGE_DEFAULT_LIMIT'], type=int)
+    if limit < 1 or limit > config['DELETION_LOG_PAGE_MAX_LIMIT']:
+        return jsonify({'message': f'limit must be between 1 and {config["DELETION_LOG_PAGE_MAX_LIMIT"]}'}), 400
+
+    before_id = request.args.get('before_log_id', type=int)
+    after_id = request.args.get('after_log_id', type=int)
+    if before_id is not None and after_id is not None:
+        return jsonify({'message': 'Use either before_log_id or after_log_id, not both'}), 400
+
+    bounds = {}
+    for name in ('since', 'until'):
+        if request.args.get(name):
+            try:
+                bounds[name] = datetime.fromisoformat(request.args[name])
+            except ValueError:
+                return jsonify({'message': f'{name} must be an ISO 8601 timestamp'}), 400
+
+    page = employee_service.get_equipment_type_deletion_logs_page(before_id, after_id, limit=limit, **bounds)
+    if _wants_columnar():
+        page = dict(employee_service.to_columnar(page['items']), nextCursor=page['nextCursor'],
+                    hasMore=page['hasMore'])
+    return jsonify(page)
+
+@employee_bp.route('/equipment_types/logs/archive', methods=['POST'])
+def archive_equipment_type_logs_route():
+    # Перенесення записів, старших за retention_days, в архів; статус — GET /jobs/<job_id>
+    data = request.get_json(silent=True) or {}
+    retention_days = data.get('retention_days')
+    if retention_days is not None and (type(retention_days) is not int or retention_days < 0):
+        return jsonify({'message': 'retention_days must be a non-negative integer'}), 400
+
+    job, created = employee_service.submit_archive_deletion_logs(retention_days)
+    body = job.to_dict()
+    body['statusUrl'] = url_for('employee.get_job_route', job_id=job.id)
+    if not created:
+        body['message'] = 'Архівування журналу вже виконується'
+        return jsonify(body), 409
+    body['message'] = 'Архівування журналу видалень поставлено в чергу'
+    return jsonify(body), 202
+
+
+
+# ----------------------------------------
+# IV. ПОТОКОВИЙ ЕКСПОРТ
+# ----------------------------------------
+
+EXPORT_MIMETYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+def _export_response(export_method, filename):
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in EXPORT_MIMETYPES:
+        return jsonify({'message': f'Unsupported export format: {fmt} (use ndjson or csv)'}), 400
+    response = Response(stream_with_context(export_method(fmt)), mimetype=EXPORT_MIMETYPES[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename={filename}.{fmt}'
+    return response
+
+@employee_bp.route('/export', methods=['GET'])
+def export_employees_route():
+    return _export_response(employee_service.export_employees, 'employees')
+
+@employee_bp.route('/equipment_by_type_report/export', methods=['GET'])
+def export_equipment_report_route():
+    return _export_response(employee_service.export_equipment_report, 'equipment_by_type_report')
+
+@employee_bp.route('/equipment_types/logs/export', methods=['GET'])
+def export_equipment_type_logs_route():
+    return _export_response(employee_service.export_equipment_type_deletion_logs, 'equipment_type_deletion_log')
+
+
+# ----------------------------------------
+# V. ПОДІЇ ЗМІН (Server-Sent Events)
+# ----------------------------------------
+
+def _sse_stream(subscription, heartbeat):
+    try:
+        yield 'retry: 5000\n\n'
+        while True:
+            events, dropped = subscription.wait(heartbeat)
+            if dropped:
+                # Буфер переповнився — клієнту слід перечитати дані (напр. через /changes)
+                yield 'event: overflow\ndata: {}\n\n'.format(json.dumps({'dropped': dropped}))
+            if not events and not dropped:
+                yield ': heartbeat\n\n'
+            for event in events:
+                yield 'id: {}\nevent: {}\ndata: {}\n\n'.format(
+                    event['id'], event['type'], json.dumps(event['data'], ensure_ascii=False, default=str))
+    finally:
+        subscription.close()
+
+@employee_bp.route('/events', methods=['GET'])
+def events_route():
+    # ?types=employee.created,equipment_type.deleted — лише вибрані типи подій
+    event_types = [t.strip() for t in request.args.get('types', '').split(',') if t.strip()]
+    subscription = employee_service.subscribe_events(event_types)
+    if subscription is None:
+        return jsonify({'message': 'Too many event subscribers'}), 503
+
+    response = Response(_sse_stream(subscription, current_app.config['EVENTS_HEARTBEAT_SECONDS']),
+                        mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    # Якщо клієнт відключився ще до першої події, генератор не запускався
+    response.call_on_close(subscription.close)
+    return response
+
+
+# ----------------------------------------
+# VI. ДІАГНОСТИКА
+# ----------------------------------------
+
+@employee_bp.route('/pool_stats', methods=['GET'])
+def get_pool_stats_route():
+    return jsonify(employee_service.get_pool_stats()), 200
+
+@employee_bp.route('/cache_stats', methods=['GET'])
+def get_cache_stats_route():
+    return jsonify(employee_service.get_cache_stats()), 200
+
+@employee_bp.route('/admission_stats', methods=['GET'])
+def get_admission_stats_route():
+    return jsonify(employee_service.get_admission_stats()), 200
+
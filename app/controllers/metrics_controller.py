@@ -0,0 +1,61 @@
+# app/controllers/metrics_controller.py
+
+from flask import Blueprint, Response, current_app
+from app.metrics import registry
+from app.services.employee_service import EmployeeService
+
+metrics_bp = Blueprint('metrics', __name__)
+employee_service = EmployeeService()
+
+
+@registry.gauge_collector
+def _pool_gauges():
+    stats = employee_service.get_pool_stats()
+    return [
+        ('employee_db_pool_connections', 'Pool connections by state', {'state': 'in_use'}, stats['in_use']),
+        ('employee_db_pool_connections', 'Pool connections by state', {'state': 'idle'}, stats['idle']),
+        ('employee_db_pool_waiting', 'Threads waiting for a pool connection', None, stats['waiting']),
+        ('employee_db_pool_waits_total', 'Checkouts that had to wait', None, stats['waits']),
+        ('employee_db_pool_timeouts_total', 'Checkouts that timed out', None, stats['timeouts']),
+    ] + [
+        ('employee_db_replica_pool_in_use', 'Replica pool connections in use', {'replica': str(i)}, replica['in_use'])
+        for i, replica in enumerate(stats['replicas'])
+    ]
+
+
+@registry.gauge_collector
+def _cache_gauges():
+    stats = employee_service.get_cache_stats()
+    return [
+        ('employee_cache_events_total', 'Employee cache events', {'event': name}, stats[name])
+        for name in ('hits', 'misses', 'evictions', 'expirations')
+    ]
+
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def metrics_route():
+    return Response(registry.render(current_app.config['METRICS_MULTIPROC_DIR']), mimetype='text/plain; version=0.0.4')
+
+
+@registry.gauge_collector
+def _single_flight_gauges():
+    stats = employee_service.get_single_flight_stats()
+    return [
+        ('employee_single_flight_calls_total', 'Coalesced report calls by outcome', {'outcome': name}, stats[name])
+        for name in ('executions', 'shared', 'reused')
+    ]
+
+
+@registry.gauge_collector
+def _admission_gauges():
+    stats = employee_service.get_admission_stats()
+    return [
+        ('employee_admission_active', 'Requests holding a DB slot', None, stats['active']),
+        ('employee_admission_queue_depth', 'Requests waiting for a DB slot', None, stats['queued']),
+        ('employee_admission_rejections_total', 'Requests rejected with 503', {'reason': 'queue_full'},
+         stats['rejected_queue_full']),
+        ('employee_admission_rejections_total', 'Requests rejected with 503', {'reason': 'timeout'},
+         stats['rejected_timeout']),
+        ('employee_admission_evictions_total', 'Queued requests displaced by higher priority', None, stats['evicted']),
+    ]
+
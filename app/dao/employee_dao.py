@@ -1,20 +1,113 @@
 # app/dao/employee_dao.py
 
+import itertools
+import time
+
 import pymysql
 import pymysql.err
-from flask import current_app 
+from flask import current_app, g, has_request_context, request
+from app.dao.connection_pool import PoolTimeoutError, get_pool, get_replica_pools
+from app.metrics import db_connection_acquire_seconds, instrument_dao
 
 class EmployeeDAO:
     
-    def get_db_connection(self):
-        config = current_app.config 
-        return pymysql.connect(
-            host=config['MYSQL_HOST'],
-            user=config['MYSQL_USER'],
-            password=config['MYSQL_PASSWORD'],
-            db=config['MYSQL_DB'],
-            cursorclass=pymysql.cursors.DictCursor
-        )
+    def __init__(self):
+        self._replica_counter = itertools.count()
+
+    def get_db_connection(self, read_only=False, use_primary=False):
+        # Записи — завжди на primary; методи лише для читання можуть іти на репліку,
+        # якщо use_primary не вимагає свіжих даних (напр. для заповнення кешу)
+        start = time.perf_counter()
+        conn = self._acquire(read_only, use_primary)
+        db_connection_acquire_seconds.observe(time.perf_counter() - start)
+        return conn
+
+    def _acquire(self, read_only, use_primary=False):
+        if not read_only:
+            if has_request_context():
+                g.db_wrote_primary = True
+            return get_pool(current_app).acquire()
+
+        replicas = get_replica_pools(current_app)
+        if replicas and not use_primary and self._reads_from_replica():
+            pool = self._pick_replica(replicas)
+            if pool is not None:
+                try:
+                    return pool.acquire()
+                except (PoolTimeoutError, pymysql.err.MySQLError) as e:
+                    print(f"Replica unavailable, reading from primary: {e}")
+                    if has_request_context():
+                        # Решта читань цього запиту теж іде на primary
+                        g.db_replica = None
+        return get_pool(current_app).acquire()
+
+    def _reads_from_replica(self):
+        # X-Read-Consistency: primary — примусове читання з primary для запиту;
+        # READ_YOUR_WRITES — після запису в цьому ж запиті читання йдуть на primary
+        if not has_request_context():
+            return True
+        config = current_app.config
+        if request.headers.get('X-Read-Consistency', config['READ_CONSISTENCY_DEFAULT']) == 'primary':
+            return False
+        return not (config['READ_YOUR_WRITES'] and g.get('db_wrote_primary'))
+
+    def _pick_replica(self, replicas):
+        # Одна репліка на весь запит: версії для ETag (@conditional) і тіло відповіді
+        # читаються з однієї репліки, тож тег ніколи не новіший за тіло
+        if has_request_context():
+            if 'db_replica' not in g:
+                g.db_replica = self._choose_replica(replicas)
+            return g.db_replica
+        return self._choose_replica(replicas)
+
+    def _choose_replica(self, replicas):
+        if current_app.config['REPLICA_SELECTION'] == 'least_loaded':
+            return min(replicas, key=lambda pool: pool.in_use)
+        return replicas[next(self._replica_counter) % len(replicas)]
+
+    def get_pool_stats(self):
+        stats = get_pool(current_app).stats()
+        stats['replicas'] = [pool.stats() for pool in get_replica_pools(current_app)]
+        return stats
+
+    def _bump_table_version(self, cursor, table_name):
+        # Виконується в транзакції запису; нова версія повертається через LAST_INSERT_ID(expr)
+        cursor.execute(
+            "UPDATE table_versions SET version = LAST_INSERT_ID(version + 1) WHERE table_name = %s",
+            (table_name,))
+        return cursor.lastrowid
+
+    def get_table_versions(self, table_names):
+        conn = self.get_db_connection(read_only=True)
+        cursor = conn.cursor()
+        sql = "SELECT table_name, version FROM table_versions WHERE table_name IN ({})".format(
+            ', '.join(['%s'] * len(table_names)))
+        try:
+            cursor.execute(sql, tuple(table_names))
+            return {row['table_name']: row['version'] for row in cursor.fetchall()}
+        finally:
+            cursor.close()
+            conn.close()
+
+    def _stream_query(self, sql, params=()):
+        # Небуферизований курсор: рядки читаються з сокета по одному,
+        # тому пам'ять не залежить від розміру результату.
+        conn = self.get_db_connection(read_only=True)
+        cursor = conn.cursor(pymysql.cursors.SSDictCursor)
+        finished = False
+        try:
+            cursor.execute(sql, params)
+            for row in cursor:
+                yield row
+            finished = True
+        finally:
+            if finished:
+                cursor.close()
+                conn.close()
+            else:
+                # Клієнт відключився або сталася помилка: cursor.close() дочитав би
+                # решту результату з сокета, тому з'єднання закривається без повернення в пул
+                conn.discard()
 
     # ----------------------------------------
     # I. EMPLOYEE CRUD 
@@ -25,16 +118,18 @@ class EmployeeDAO:
         cursor = conn.cursor()
         sql = """
             INSERT INTO employees 
-            (first_name, last_name, email, department_id, is_it_staff) 
-            VALUES (%s, %s, %s, %s, %s)
+            (first_name, last_name, email, department_id, is_it_staff, row_version) 
+            VALUES (%s, %s, %s, %s, %s, %s)
         """
         try:
+            version = self._bump_table_version(cursor, 'employees')
             cursor.execute(sql, (
                 data['first_name'], 
                 data['last_name'], 
                 data['email'], 
                 data['department_id'],
-                data.get('is_it_staff', False)
+                data.get('is_it_staff', False),
+                version
             ))
             conn.commit()
             return cursor.lastrowid
@@ -46,9 +141,53 @@ class EmployeeDAO:
             cursor.close()
             conn.close() 
 
-    def get_employee_by_id(self, employee_id):
+    def bulk_create_employees(self, indexed_rows, chunk_size=500):
+        # indexed_rows: [(номер рядка у вхідних даних, dict)].
+        # Кожен чанк — один багаторядковий INSERT (executemany) і один commit.
+        # Якщо чанк падає (напр. дублікат email), він повторюється по рядку,
+        # щоб помилка дісталася лише поганим рядкам.
         conn = self.get_db_connection()
         cursor = conn.cursor()
+        sql = """
+            INSERT INTO employees 
+            (first_name, last_name, email, department_id, is_it_staff, row_version) 
+            VALUES (%s, %s, %s, %s, %s, %s)
+        """
+        created = 0
+        errors = []
+        try:
+            for start in range(0, len(indexed_rows), chunk_size):
+                chunk = indexed_rows[start:start + chunk_size]
+                params = [
+                    (r['first_name'], r['last_name'], r['email'], r['department_id'], r['is_it_staff'])
+                    for _, r in chunk
+                ]
+                try:
+                    version = self._bump_table_version(cursor, 'employees')
+                    cursor.executemany(sql, [p + (version,) for p in params])
+                    conn.commit()
+                    created += len(chunk)
+                    continue
+                except pymysql.err.MySQLError:
+                    conn.rollback()
+
+                for (index, _), row_params in zip(chunk, params):
+                    try:
+                        version = self._bump_table_version(cursor, 'employees')
+                        cursor.execute(sql, row_params + (version,))
+                        conn.commit()
+                        created += 1
+                    except pymysql.err.MySQLError as e:
+                        conn.rollback()
+                        errors.append((index, str(e)))
+            return created, errors
+        finally:
+            cursor.close()
+            conn.close()
+
+    def get_employee_by_id(self, employee_id, use_primary=False):
+        conn = self.get_db_connection(read_only=True, use_primary=use_primary)
+        cursor = conn.cursor()
         sql = "SELECT * FROM employees WHERE employee_id = %s"
         try:
             cursor.execute(sql, (employee_id,))
@@ -58,8 +197,24 @@ class EmployeeDAO:
             cursor.close()
             conn.close()
 
+    def get_employees_by_ids(self, employee_ids, chunk_size=1000, use_primary=False):
+        # Один запит IN (...) на кожні chunk_size ID, усе — в одному з'єднанні
+        conn = self.get_db_connection(read_only=True, use_primary=use_primary)
+        cursor = conn.cursor()
+        employees = []
+        try:
+            for start in range(0, len(employee_ids), chunk_size):
+                chunk = employee_ids[start:start + chunk_size]
+                sql = "SELECT * FROM employees WHERE employee_id IN ({})".format(', '.join(['%s'] * len(chunk)))
+                cursor.execute(sql, chunk)
+                employees.extend(cursor.fetchall())
+            return employees
+        finally:
+            cursor.close()
+            conn.close()
+
     def get_all_employees(self):
-        conn = self.get_db_connection()
+        conn = self.get_db_connection(read_only=True)
         cursor = conn.cursor()
         sql = "SELECT * FROM employees"
         try:
@@ -70,22 +225,74 @@ class EmployeeDAO:
             cursor.close()
             conn.close()
 
+    def get_employees_page(self, columns, after_id=None, limit=100):
+        # Keyset-пагінація за employee_id; columns — лише перевірені імена колонок.
+        # Читаємо limit + 1 рядків, щоб дізнатися, чи є наступна сторінка.
+        conn = self.get_db_connection(read_only=True)
+        cursor = conn.cursor()
+        sql = "SELECT {} FROM employees WHERE employee_id > %s ORDER BY employee_id LIMIT %s".format(
+            ', '.join(columns))
+        try:
+            cursor.execute(sql, (after_id or 0, limit + 1))
+            employees = cursor.fetchall()
+            return employees
+        finally:
+            cursor.close()
+            conn.close()
+
+    def iter_all_employees(self):
+        return self._stream_query("SELECT * FROM employees ORDER BY employee_id")
+
+    def get_employee_changes(self, since_version, since_id=None, limit=500):
+        # Зміни після курсора (since_version, since_id); since_id=None — після всієї версії.
+        # Спочатку читається поточна версія: запис версії тримає блокування рядка
+        # table_versions до commit, тож усі зміни з row_version <= current вже видимі.
+        conn = self.get_db_connection(read_only=True)
+        cursor = conn.cursor()
+        after = "(row_version > %s OR (row_version = %s AND employee_id > %s)) AND row_version <= %s"
+        try:
+            cursor.execute("SELECT version FROM table_versions WHERE table_name = 'employees'")
+            current = cursor.fetchone()['version']
+            params = (since_version, since_version, since_id if since_id is not None else 2 ** 63, current, limit + 1)
+            cursor.execute(
+                "SELECT * FROM employees WHERE " + after + " ORDER BY row_version, employee_id LIMIT %s", params)
+            upserts = cursor.fetchall()
+            cursor.execute(
+                "SELECT employee_id, row_version FROM employee_tombstones WHERE " + after +
+                " ORDER BY row_version, employee_id LIMIT %s", params)
+            deletes = cursor.fetchall()
+            return current, upserts, deletes
+        finally:
+            cursor.close()
+            conn.close()
+
     def update_employee(self, employee_id, data):
+        # Перевірка існування, UPDATE і commit — в одному з'єднанні та транзакції.
+        # Повертає None, якщо працівника не знайдено.
         conn = self.get_db_connection()
         cursor = conn.cursor()
         sql = """
             UPDATE employees 
             SET first_name = %s, last_name = %s, email = %s, 
-                department_id = %s, is_it_staff = %s
+                department_id = %s, is_it_staff = %s, row_version = %s
             WHERE employee_id = %s
         """
         try:
+            cursor.execute("SELECT employee_id FROM employees WHERE employee_id = %s FOR UPDATE", (employee_id,))
+            if cursor.fetchone() is None:
+                conn.rollback()
+                return None
+            version = self._bump_table_version(cursor, 'employees')
             cursor.execute(sql, (
                 data['first_name'], data['last_name'], data['email'], 
-                data['department_id'], data['is_it_staff'], employee_id
+                data['department_id'], data['is_it_staff'], version, employee_id
             ))
             conn.commit()
-            return cursor.rowcount > 0
+            return True
+        except Exception as e:
+            print(f"Error updating employee: {e}")
+            conn.rollback()
+            return False
         finally:
             cursor.close()
             conn.close()
@@ -108,7 +315,7 @@ class EmployeeDAO:
 
     # 1. Звіт M:1: Працівники по відділах
     def get_employees_by_department(self, department_id):
-        conn = self.get_db_connection()
+        conn = self.get_db_connection(read_only=True)
         cursor = conn.cursor()
         sql = """
             SELECT 
@@ -128,7 +335,7 @@ class EmployeeDAO:
     
     # 2. Звіт M:M: Призначення заявки
     def get_assignments_for_ticket(self, ticket_id):
-        conn = self.get_db_connection()
+        conn = self.get_db_connection(read_only=True)
         cursor = conn.cursor()
         sql = """
             SELECT 
@@ -146,28 +353,61 @@ class EmployeeDAO:
             cursor.close()
             conn.close()
             
-    # 3. Звіт з Групуванням: Кількість обладнання за типом
-    def get_equipment_count_by_type(self):
-        conn = self.get_db_connection()
+    # 2.b. Звіт M:M для багатьох заявок одним запитом, не більше per_ticket_limit на заявку
+    def get_assignments_for_tickets(self, ticket_ids, per_ticket_limit):
+        conn = self.get_db_connection(read_only=True)
         cursor = conn.cursor()
         sql = """
+            SELECT ticket_id, assignment_id, first_name, last_name, email, role, assigned_at, total_count
+            FROM (
+                SELECT 
+                    ta.ticket_id, ta.assignment_id, e.first_name, e.last_name, e.email, ta.role, ta.assigned_at,
+                    ROW_NUMBER() OVER (PARTITION BY ta.ticket_id ORDER BY ta.assigned_at DESC, ta.assignment_id DESC) AS rn,
+                    COUNT(*) OVER (PARTITION BY ta.ticket_id) AS total_count
+                FROM ticket_assignments ta
+                JOIN employees e ON ta.assignee_id = e.employee_id
+                WHERE ta.ticket_id IN ({})
+            ) ranked
+            WHERE rn <= %s
+            ORDER BY ticket_id, rn
+        """.format(', '.join(['%s'] * len(ticket_ids)))
+        try:
+            cursor.execute(sql, list(ticket_ids) + [per_ticket_limit])
+            assignments = cursor.fetchall()
+            return assignments
+        finally:
+            cursor.close()
+            conn.close()
+            
+    # 3. Звіт з Групуванням: Кількість обладнання за типом
+    # Читає зведені таблиці (migrations/001_equipment_type_summary.sql), які
+    # підтримуються тригерами: один рядок на пару (тип, модель), без GROUP_CONCAT.
+    EQUIPMENT_COUNT_BY_TYPE_SQL = """
             SELECT 
+                s.equipment_type_id,
                 et.name AS type_name, 
-                COUNT(e.equipment_id) AS total_count,
-                SUM(CASE WHEN e.status = 'in_use' THEN 1 ELSE 0 END) AS in_use_count,
-                GROUP_CONCAT(e.model SEPARATOR ', ') AS models_used
-            FROM equipment_types et
-            JOIN equipment e ON et.equipment_type_id = e.equipment_type_id
-            GROUP BY et.name
-            ORDER BY total_count DESC
+                s.total_count,
+                s.in_use_count,
+                m.model
+            FROM equipment_type_summary s
+            JOIN equipment_types et ON et.equipment_type_id = s.equipment_type_id
+            LEFT JOIN equipment_type_models m ON m.equipment_type_id = s.equipment_type_id
+            ORDER BY s.total_count DESC, s.equipment_type_id, m.model
         """
+
+    def get_equipment_count_by_type(self):
+        conn = self.get_db_connection(read_only=True)
+        cursor = conn.cursor()
         try:
-            cursor.execute(sql)
+            cursor.execute(self.EQUIPMENT_COUNT_BY_TYPE_SQL)
             report = cursor.fetchall()
             return report
         finally:
             cursor.close()
             conn.close()
+
+    def iter_equipment_count_by_type(self):
+        return self._stream_query(self.EQUIPMENT_COUNT_BY_TYPE_SQL)
             
     # ----------------------------------------
     # III. ЗАВДАННЯ ЛР №5
@@ -271,21 +511,119 @@ class EmployeeDAO:
 
 # app/dao/employee_dao.py (ДОДАТИ всередині класу EmployeeDAO)
 
+    # 2.b.ii. Пакетне призначення: пошук ID за іменами/заголовками та одна транзакція вставки
+    def find_employee_ids_by_names(self, name_pairs, chunk_size=500):
+        conn = self.get_db_connection(read_only=True)
+        cursor = conn.cursor()
+        rows = []
+        try:
+            for start in range(0, len(name_pairs), chunk_size):
+                chunk = name_pairs[start:start + chunk_size]
+                sql = "SELECT employee_id, first_name, last_name FROM employees WHERE (first_name, last_name) IN ({})".format(
+                    ', '.join(['(%s, %s)'] * len(chunk)))
+                cursor.execute(sql, [value for pair in chunk for value in pair])
+                rows.extend(cursor.fetchall())
+            return rows
+        finally:
+            cursor.close()
+            conn.close()
+
+    def find_ticket_ids_by_titles(self, titles, chunk_size=500):
+        conn = self.get_db_connection(read_only=True)
+        cursor = conn.cursor()
+        rows = []
+        try:
+            for start in range(0, len(titles), chunk_size):
+                chunk = titles[start:start + chunk_size]
+                sql = "SELECT ticket_id, title FROM tickets WHERE title IN ({})".format(', '.join(['%s'] * len(chunk)))
+                cursor.execute(sql, chunk)
+                rows.extend(cursor.fetchall())
+            return rows
+        finally:
+            cursor.close()
+            conn.close()
+
+    def bulk_create_ticket_assignments(self, assignments):
+        # assignments: [(ticket_id, assignee_id, role)] — усі в одній транзакції
+        conn = self.get_db_connection()
+        cursor = conn.cursor()
+        sql = "INSERT INTO ticket_assignments (ticket_id, assignee_id, role) VALUES (%s, %s, %s)"
+        try:
+            cursor.executemany(sql, assignments)
+            conn.commit()
+            return len(assignments)
+        except Exception as e:
+            print(f"Error inserting ticket assignments: {e}")
+            conn.rollback()
+            return None
+        finally:
+            cursor.close()
+            conn.close()
+
     # 2.c. SP: Пакетна вставка (equipment_types)
-    def batch_insert_equipment_types_sp(self, start_id=4):
+    def _match_equipment_types(self, cursor, names, chunk_size, lock=False):
+        # {позиція в names: рядок equipment_types} за правилами колації колонки name
+        # (регістр, наголоси, кінцеві пробіли) — порівнює сам MySQL: FIELD(name, ...)
+        # повертає номер першої запитаної назви, рівної рядку. Частинами, бо FIELD
+        # перебирає всі аргументи для кожного знайденого рядка.
+        # lock=True — блокуюче читання: видно й рядки, зафіксовані паралельними запитами
+        # після початку транзакції.
+        sql = """
+            SELECT equipment_type_id, name, FIELD(name, {0}) AS position
+            FROM equipment_types WHERE name IN ({0})
+        """
+        if lock:
+            sql += " LOCK IN SHARE MODE"
+        matched, seen_ids = {}, set()
+        for start in range(0, len(names), chunk_size):
+            chunk = names[start:start + chunk_size]
+            cursor.execute(sql.format(', '.join(['%s'] * len(chunk))), chunk + chunk)
+            for row in sorted(cursor.fetchall(), key=lambda r: r['position']):
+                # Рівні для БД назви в різних частинах запиту — один рядок, за першою позицією
+                if row['equipment_type_id'] in seen_ids or start + row['position'] - 1 in matched:
+                    continue
+                seen_ids.add(row['equipment_type_id'])
+                row['position'] = start + row['position'] - 1
+                matched[row['position']] = row
+        return matched
+
+    def bulk_create_equipment_types(self, names, chunk_size=1000):
+        # names — унікальні назви. В одній транзакції: зіставлення з наявними рядками,
+        # багаторядковий INSERT решти (executemany об'єднує VALUES у великі пакети)
+        # і повторне зіставлення для ID. Повертає (створені, наявні) як
+        # [{equipment_type_id, name, position}] (position — індекс у names) або None при помилці.
+        # IntegrityError (назву щойно вставив паралельний запит або в пакеті є рівні для
+        # колації назви) — пакет повторюється по назві з INSERT ... WHERE NOT EXISTS:
+        # уже наявні назви потрапляють у наявні, а не в помилку.
         conn = self.get_db_connection()
         cursor = conn.cursor()
-        sql = "CALL sp_batch_insert_equipment_types(%s, @rows_inserted)"
+        insert_sql = "INSERT INTO equipment_types (name) VALUES (%s)"
+        insert_missing_sql = """
+            INSERT INTO equipment_types (name)
+            SELECT %s FROM DUAL WHERE NOT EXISTS (SELECT 1 FROM equipment_types WHERE name = %s)
+        """
         try:
-            cursor.execute(sql, (start_id,))
-            
-            # Отримання вихідного параметра
-            cursor.execute("SELECT @rows_inserted")
-            rows = cursor.fetchone()['@rows_inserted']
+            existing = self._match_equipment_types(cursor, names, chunk_size)
+            to_create = [i for i in range(len(names)) if i not in existing]
+            created_positions = set(to_create)
+            try:
+                if to_create:
+                    cursor.executemany(insert_sql, [names[i] for i in to_create])
+            except pymysql.err.IntegrityError:
+                conn.rollback()
+                existing = self._match_equipment_types(cursor, names, chunk_size)
+                created_positions = set()
+                for i in range(len(names)):
+                    if i not in existing and cursor.execute(insert_missing_sql, (names[i], names[i])):
+                        created_positions.add(i)
+
+            rows = self._match_equipment_types(cursor, names, chunk_size, lock=True)
             conn.commit()
-            return rows
+            created = [row for position, row in rows.items() if position in created_positions]
+            existing = [row for position, row in rows.items() if position not in created_positions]
+            return created, existing
         except Exception as e:
-            print(f"Error executing sp_batch_insert_equipment_types: {e}")
+            print(f"Error inserting equipment types: {e}")
             conn.rollback()
             return None
         finally:
@@ -296,7 +634,7 @@ class EmployeeDAO:
 
     # 2.d. SP + UDF: Агрегація (tickets.priority_id)
     def get_ticket_priority_stats_sp(self):
-        conn = self.get_db_connection()
+        conn = self.get_db_connection(read_only=True)
         cursor = conn.cursor()
         sql = "CALL sp_report_ticket_priority_stats()"
         try:
@@ -315,13 +653,16 @@ class EmployeeDAO:
 # app/dao/employee_dao.py (ДОДАТИ всередині класу EmployeeDAO)
 
     # 2.e.i. SP з курсором: Динамічний розподіл даних
-    def split_equipment_log_sp(self):
+    def split_equipment_log_sp(self, on_progress=None):
+        # on_progress(phase, percent) — необов'язковий колбек для фонової задачі
         conn = self.get_db_connection()
         cursor = conn.cursor()
         
         # NOTE: Ця процедура створює нові таблиці в БД
         sql = "CALL sp_split_equipment_log(@rows_moved)"
         try:
+            if on_progress:
+                on_progress('running sp_split_equipment_log', 10)
             cursor.execute(sql)
             
             # Отримання вихідного параметра
@@ -330,6 +671,8 @@ class EmployeeDAO:
             conn.commit()
             
             # Для перевірки: отримати список нових таблиць (необов'язково)
+            if on_progress:
+                on_progress('collecting created tables', 90)
             cursor.execute("SHOW TABLES LIKE 'equipment_log_%'")
             new_tables = [t[list(t.keys())[0]] for t in cursor.fetchall()]
 
@@ -349,6 +692,7 @@ class EmployeeDAO:
         cursor = conn.cursor()
         sql = "DELETE FROM employees WHERE employee_id = %s"
         try:
+            # Версію та tombstone записує тригер trg_employees_tombstone_ad
             cursor.execute(sql, (employee_id,))
             conn.commit()
             return cursor.rowcount > 0 # Якщо спрацював тригер, це буде 0 або помилка
@@ -364,13 +708,23 @@ class EmployeeDAO:
 
     # 3.b. DELETE для перевірки кардинальності (equipment_types)
     def delete_equipment_type(self, type_id):
+        # Повертає (True, запис журналу) при успіху, False — якщо тип не знайдено,
+        # рядок — текст помилки. Запис журналу, створений тригером, читається в тій самій
+        # транзакції до commit: паралельні видалення і репліки на нього не впливають.
         conn = self.get_db_connection()
         cursor = conn.cursor()
         sql = "DELETE FROM equipment_types WHERE equipment_type_id = %s"
         try:
             cursor.execute(sql, (type_id,))
+            if cursor.rowcount == 0:
+                conn.rollback()
+                return False
+            cursor.execute(
+                "SELECT * FROM equipment_type_deletion_log WHERE equipment_type_id = %s "
+                "ORDER BY log_id DESC LIMIT 1", (type_id,))
+            log_entry = cursor.fetchone()
             conn.commit()
-            return cursor.rowcount > 0
+            return True, log_entry
         except Exception as e:
             conn.rollback()
             # Повертаємо текст помилки тригера
@@ -383,7 +737,7 @@ class EmployeeDAO:
 
     # 3.c. Отримання логів (для перевірки логування)
     def get_equipment_type_deletion_logs(self):
-        conn = self.get_db_connection()
+        conn = self.get_db_connection(read_only=True)
         cursor = conn.cursor()
         sql = "SELECT * FROM equipment_type_deletion_log ORDER BY log_id DESC"
         try:
@@ -395,4 +749,94 @@ class EmployeeDAO:
             return None
         finally:
             cursor.close()
-            conn.close()
\ No newline at end of file
+            conn.close()
+
+    def iter_equipment_type_deletion_logs(self):
+        return self._stream_query("SELECT * FROM equipment_type_deletion_log ORDER BY log_id DESC")
+
+    # Запити журналу статичні, щоб tools/index_audit.py міг відтворити їх для EXPLAIN.
+    # Незадані фільтри передаються як NULL: MySQL згортає "NULL IS NULL OR ..." ще до
+    # вибору індексу, тож план такий самий, як для запиту лише з заданими умовами.
+    DELETION_LOG_FILTERS = """
+        (%s IS NULL OR log_id < %s) AND (%s IS NULL OR log_id > %s)
+        AND (%s IS NULL OR deleted_at >= %s) AND (%s IS NULL OR deleted_at < %s)
+    """
+
+    def get_equipment_type_deletion_logs_page(self, before_id=None, after_id=None, since=None, until=None,
+                                              limit=100):
+        # Keyset-пагінація за log_id: before_id — старіші записи (від новіших),
+        # after_id — новіші за останній побачений (за зростанням, режим tail).
+        # Читаємо limit + 1 рядків, щоб дізнатися, чи є наступна сторінка.
+        page_sql = "SELECT * FROM equipment_type_deletion_log WHERE" + self.DELETION_LOG_FILTERS + \
+            "ORDER BY log_id DESC LIMIT %s"
+        tail_sql = "SELECT * FROM equipment_type_deletion_log WHERE" + self.DELETION_LOG_FILTERS + \
+            "ORDER BY log_id ASC LIMIT %s"
+        params = (before_id, before_id, after_id, after_id, since, since, until, until, limit + 1)
+
+        conn = self.get_db_connection(read_only=True)
+        cursor = conn.cursor()
+        try:
+            if after_id is not None:
+                cursor.execute(tail_sql, params)
+            else:
+                cursor.execute(page_sql, params)
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+            conn.close()
+
+    def count_equipment_type_deletion_logs_before(self, cutoff):
+        conn = self.get_db_connection()
+        cursor = conn.cursor()
+        sql = "SELECT COUNT(*) AS n FROM equipment_type_deletion_log WHERE deleted_at < %s"
+        try:
+            cursor.execute(sql, (cutoff,))
+            return cursor.fetchone()['n']
+        finally:
+            cursor.close()
+            conn.close()
+
+    def archive_equipment_type_deletion_logs(self, cutoff, chunk_size, write_rows):
+        # Переносить записи старші за cutoff частинами по chunk_size: кожна частина
+        # спершу передається в write_rows (архів), потім видаляється в тій самій транзакції.
+        # Якщо процес упаде між записом архіву і commit, частина потрапить в архів
+        # повторно при наступному запуску — дублікати в архіві допустимі, втрати — ні.
+        conn = self.get_db_connection()
+        cursor = conn.cursor()
+        select_sql = """
+            SELECT * FROM equipment_type_deletion_log
+            WHERE deleted_at < %s AND log_id > %s
+            ORDER BY log_id
+            LIMIT %s
+            FOR UPDATE
+        """
+        moved = 0
+        last_id = 0
+        try:
+            while True:
+                cursor.execute(select_sql, (cutoff, last_id, chunk_size))
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+                write_rows(rows)
+                ids = [row['log_id'] for row in rows]
+                cursor.execute(
+                    "DELETE FROM equipment_type_deletion_log WHERE log_id IN ({})".format(
+                        ', '.join(['%s'] * len(ids))), ids)
+                conn.commit()
+                moved += len(rows)
+                last_id = ids[-1]
+            return moved
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+
+
+instrument_dao(EmployeeDAO, exclude=('get_db_connection', 'get_pool_stats'), row_counts={
+    'bulk_create_employees': lambda result: result[0],
+    'get_employee_changes': lambda result: len(result[1]) + len(result[2]),
+    'bulk_create_equipment_types': lambda result: len(result[0]) + len(result[1]),
+})
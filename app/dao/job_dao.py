@@ -0,0 +1,149 @@
+# app/dao/job_dao.py
+
+import json
+
+import pymysql.err
+from flask import current_app
+
+from app.dao.connection_pool import get_pool
+from app.metrics import instrument_dao
+
+JOB_COLUMNS = ('job_id', 'kind', 'status', 'phase', 'percent', 'result', 'error',
+               'submitted_at', 'started_at', 'finished_at')
+
+
+class JobAlreadyActive(Exception):
+    pass
+
+
+class JobDAO:
+    # Стан фонових задач у таблиці background_jobs (migrations/005_background_jobs.sql)
+
+    def get_db_connection(self):
+        return get_pool(current_app).acquire()
+
+    def _row_to_job(self, row):
+        if row is None:
+            return None
+        row = dict(row)
+        if row['result'] is not None:
+            row['result'] = json.loads(row['result'])
+        return row
+
+    def create_job(self, job_id, kind, phase, submitted_at):
+        # JobAlreadyActive, якщо задача цього виду вже queued/running (UNIQUE active_kind)
+        conn = self.get_db_connection()
+        cursor = conn.cursor()
+        sql = """
+            INSERT INTO background_jobs (job_id, kind, active_kind, status, phase, percent, submitted_at)
+            VALUES (%s, %s, %s, 'queued', %s, 0, %s)
+        """
+        try:
+            cursor.execute(sql, (job_id, kind, kind, phase, submitted_at))
+            conn.commit()
+        except pymysql.err.IntegrityError:
+            conn.rollback()
+            raise JobAlreadyActive(kind)
+        finally:
+            cursor.close()
+            conn.close()
+
+    def get_job(self, job_id):
+        conn = self.get_db_connection()
+        cursor = conn.cursor()
+        sql = "SELECT {} FROM background_jobs WHERE job_id = %s".format(', '.join(JOB_COLUMNS))
+        try:
+            cursor.execute(sql, (job_id,))
+            return self._row_to_job(cursor.fetchone())
+        finally:
+            cursor.close()
+            conn.close()
+
+    def get_active_job(self, kind):
+        # Разом із ознакою, чи тримає якийсь процес блокування цього виду
+        conn = self.get_db_connection()
+        cursor = conn.cursor()
+        sql = """
+            SELECT {}, IS_USED_LOCK(%s) IS NOT NULL AS lock_held
+            FROM background_jobs WHERE active_kind = %s
+        """.format(', '.join(JOB_COLUMNS))
+        try:
+            cursor.execute(sql, (self.lock_name(kind), kind))
+            return self._row_to_job(cursor.fetchone())
+        finally:
+            cursor.close()
+            conn.close()
+
+    def update_job(self, job_id, **fields):
+        # fields — колонки з JOB_COLUMNS; finished=True знімає active_kind
+        if fields.pop('finished', False):
+            fields['active_kind'] = None
+        if 'result' in fields and fields['result'] is not None:
+            fields['result'] = json.dumps(fields['result'], default=str)
+        conn = self.get_db_connection()
+        cursor = conn.cursor()
+        sql = "UPDATE background_jobs SET {} WHERE job_id = %s".format(
+            ', '.join('{} = %s'.format(column) for column in fields))
+        try:
+            cursor.execute(sql, list(fields.values()) + [job_id])
+            conn.commit()
+        finally:
+            cursor.close()
+            conn.close()
+
+    def trim_history(self, keep):
+        # Лишає keep найновіших задач; активні не видаляються
+        conn = self.get_db_connection()
+        cursor = conn.cursor()
+        sql = """
+            DELETE FROM background_jobs
+            WHERE active_kind IS NULL AND job_id NOT IN (
+                SELECT job_id FROM (
+                    SELECT job_id FROM background_jobs ORDER BY submitted_at DESC LIMIT %s
+                ) newest
+            )
+        """
+        try:
+            cursor.execute(sql, (keep,))
+            conn.commit()
+        finally:
+            cursor.close()
+            conn.close()
+
+    # ----------------------------------------
+    # Блокування виду задачі (GET_LOCK)
+    # ----------------------------------------
+
+    def lock_name(self, kind):
+        return 'job:' + kind
+
+    def acquire_kind_lock(self, kind):
+        # Повертає з'єднання, що тримає блокування, або None, якщо його тримає інший процес.
+        # Блокування прив'язане до сесії: якщо процес помре, MySQL зніме його сам.
+        conn = self.get_db_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT GET_LOCK(%s, 0) AS acquired", (self.lock_name(kind),))
+            acquired = cursor.fetchone()['acquired'] == 1
+        except Exception:
+            cursor.close()
+            conn.discard()
+            raise
+        cursor.close()
+        if not acquired:
+            conn.close()
+            return None
+        return conn
+
+    def release_kind_lock(self, conn, kind):
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (self.lock_name(kind),))
+            cursor.close()
+            conn.close()
+        except Exception:
+            # З'єднання з недоступним станом блокування не повертаємо в пул
+            conn.discard()
+
+
+instrument_dao(JobDAO, exclude=('get_db_connection', 'lock_name', 'acquire_kind_lock', 'release_kind_lock'))
@@ -0,0 +1,29 @@
+# app/json_provider.py
+
+try:
+    import orjson
+except ImportError:  # без orjson працює стандартний json
+    orjson = None
+
+from app.metrics import TimedJSONProvider
+
+
+class FastJSONProvider(TimedJSONProvider):
+    # Кодування через orjson. Формат відповідей не змінюється: ключі сортуються,
+    # а datetime/Decimal/UUID передаються в default() Flask, як і раніше.
+
+    def _dumps(self, obj, **kwargs):
+        # Flask передає separators для компактного виводу — orjson і так компактний.
+        # indent та інші параметри json.dumps orjson не підтримує.
+        if orjson is None or any(k != 'separators' for k in kwargs):
+            return super()._dumps(obj, **kwargs)
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+
+
+JSON_PROVIDERS = {
+    'default': TimedJSONProvider,
+    'fast': FastJSONProvider,
+}
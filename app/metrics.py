@@ -0,0 +1,376 @@
+# app/metrics.py
+
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+
+from flask import current_app, g, request
+from flask.json.provider import DefaultJSONProvider
+
+slow_query_log = logging.getLogger('app.dao.slow_query')
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ROW_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000, 1000000)
+
+
+def _format_labels(labels, extra=None):
+    items = list(labels)
+    if extra:
+        items.append(extra)
+    if not items:
+        return ''
+    return '{' + ','.join('%s="%s"' % (k, str(v).replace('\\', '\\\\').replace('"', '\\"')) for k, v in items) + '}'
+
+
+class Histogram:
+
+    def __init__(self, name, help_text, label_names=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(n, '') for n in self.label_names)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            counts = series[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return [[list(key), list(counts), total, count] for key, (counts, total, count) in self._series.items()]
+
+    def merge(self, snapshots):
+        series = {}
+        for snapshot in snapshots:
+            for key, counts, total, count in snapshot:
+                merged = series.setdefault(tuple(key), [[0] * len(self.buckets), 0.0, 0])
+                merged[0] = [a + b for a, b in zip(merged[0], counts)]
+                merged[1] += total
+                merged[2] += count
+        return series
+
+    def render(self, series=None):
+        if series is None:
+            series = self.merge([self.snapshot()])
+        lines = ['# HELP %s %s' % (self.name, self.help_text), '# TYPE %s histogram' % self.name]
+        for key, (counts, total, count) in sorted(series.items()):
+            labels = list(zip(self.label_names, key))
+            for bound, bucket_count in zip(self.buckets, counts):
+                lines.append('%s_bucket%s %d' % (self.name, _format_labels(labels, ('le', bound)), bucket_count))
+            lines.append('%s_bucket%s %d' % (self.name, _format_labels(labels, ('le', '+Inf')), count))
+            lines.append('%s_sum%s %s' % (self.name, _format_labels(labels), repr(total)))
+            lines.append('%s_count%s %d' % (self.name, _format_labels(labels), count))
+        return lines
+
+
+class Counter:
+
+    def __init__(self, name, help_text, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(n, '') for n in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def snapshot(self):
+        with self._lock:
+            return [[list(key), value] for key, value in self._values.items()]
+
+    def merge(self, snapshots):
+        values = {}
+        for snapshot in snapshots:
+            for key, value in snapshot:
+                values[tuple(key)] = values.get(tuple(key), 0) + value
+        return values
+
+    def render(self, series=None):
+        if series is None:
+            series = self.merge([self.snapshot()])
+        lines = ['# HELP %s %s' % (self.name, self.help_text), '# TYPE %s counter' % self.name]
+        for key, value in sorted(series.items()):
+            lines.append('%s%s %s' % (self.name, _format_labels(zip(self.label_names, key)), value))
+        return lines
+
+
+class MetricsRegistry:
+    # Метрики процесу. Gauge-значення (пул, кеш) збираються під час рендерингу.
+    #
+    # Під gunicorn кожен воркер має власні лічильники, а scrape потрапляє у випадковий
+    # воркер. Тому з multiproc_dir кожен процес періодично пише знімок своїх метрик
+    # у <dir>/<pid>.json (див. start_snapshot_writer), а render() підсумовує знімки
+    # всіх процесів. Знімок завершеного воркера лишається як <pid>.dead.json, щоб
+    # лічильники не зменшувалися: при штатному завершенні його пише сам воркер
+    # (mark_dead), а для вбитого — master із останнього періодичного знімка (reap).
+    # Gauge-значення беруться лише з живих процесів і мають мітку pid.
+
+    def __init__(self):
+        self._metrics = []
+        self._gauge_collectors = []
+
+    def histogram(self, *args, **kwargs):
+        metric = Histogram(*args, **kwargs)
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, *args, **kwargs):
+        metric = Counter(*args, **kwargs)
+        self._metrics.append(metric)
+        return metric
+
+    def gauge_collector(self, func):
+        # func() -> [(name, help, {labels} або None, value)]; назви на *_total — лічильники
+        # процесу (TYPE counter), решта — gauge
+        self._gauge_collectors.append(func)
+        return func
+
+    def _collect_gauges(self):
+        gauges = []
+        for collector in self._gauge_collectors:
+            for name, help_text, labels, value in collector():
+                gauges.append([name, help_text, labels or {}, value])
+        return gauges
+
+    def snapshot(self, with_gauges=True):
+        return {
+            'metrics': {metric.name: metric.snapshot() for metric in self._metrics},
+            'gauges': self._collect_gauges() if with_gauges else [],
+        }
+
+    def _write(self, path, snapshot):
+        tmp = path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(snapshot, f)
+        os.replace(tmp, path)
+
+    def write_snapshot(self, directory):
+        self._write(os.path.join(directory, '%d.json' % os.getpid()), self.snapshot())
+
+    def mark_dead(self, directory):
+        # Фінальний знімок воркера при штатному завершенні: лічильники залишаються в сумі, gauge — ні
+        live = os.path.join(directory, '%d.json' % os.getpid())
+        self._write(os.path.join(directory, '%d.dead.json' % os.getpid()), self.snapshot(with_gauges=False))
+        if os.path.exists(live):
+            os.remove(live)
+
+    def reap(self, directory, pid):
+        # Викликає master (gunicorn child_exit) для кожного завершеного воркера, зокрема
+        # вбитого SIGKILL / OOM / за timeout, коли mark_dead у ньому не виконався:
+        # останній періодичний знімок стає мертвим без gauge-значень
+        live = os.path.join(directory, '%d.json' % pid)
+        dead = os.path.join(directory, '%d.dead.json' % pid)
+        if not os.path.exists(dead):
+            try:
+                with open(live) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                return
+            self._write(dead, dict(snapshot, gauges=[]))
+        if os.path.exists(live):
+            os.remove(live)
+
+    def _load_snapshots(self, directory):
+        snapshots = []
+        for filename in os.listdir(directory):
+            if not filename.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(directory, filename)) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue
+            pid = filename.split('.')[0]
+            snapshots.append((pid, filename.endswith('.dead.json'), snapshot))
+        return snapshots
+
+    def _render_gauges(self, gauges, lines):
+        seen = set()
+        for name, help_text, labels, value in gauges:
+            if name not in seen:
+                seen.add(name)
+                lines.append('# HELP %s %s' % (name, help_text))
+                lines.append('# TYPE %s %s' % (name, 'counter' if name.endswith('_total') else 'gauge'))
+            lines.append('%s%s %s' % (name, _format_labels(labels.items()), value))
+
+    def render(self, multiproc_dir=None):
+        lines = []
+        if multiproc_dir is None:
+            for metric in self._metrics:
+                lines.extend(metric.render())
+            self._render_gauges(self._collect_gauges(), lines)
+            return '\n'.join(lines) + '\n'
+
+        # Власний знімок оновлюється перед злиттям, решта — не старша за інтервал запису
+        self.write_snapshot(multiproc_dir)
+        snapshots = self._load_snapshots(multiproc_dir)
+        for metric in self._metrics:
+            lines.extend(metric.render(metric.merge(
+                snapshot['metrics'].get(metric.name, []) for _, _, snapshot in snapshots)))
+        gauges = [
+            [name, help_text, dict(labels, pid=pid), value]
+            for pid, dead, snapshot in sorted(snapshots, key=lambda item: item[0]) if not dead
+            for name, help_text, labels, value in snapshot['gauges']
+        ]
+        self._render_gauges(sorted(gauges, key=lambda g: g[0]), lines)
+        return '\n'.join(lines) + '\n'
+
+
+def start_snapshot_writer(app):
+    # Фоновий потік воркера, що пише знімок метрик кожні METRICS_SNAPSHOT_INTERVAL с
+    directory = app.config['METRICS_MULTIPROC_DIR']
+    if not directory:
+        return
+    stop = threading.Event()
+
+    def loop():
+        while not stop.is_set():
+            try:
+                with app.app_context():
+                    registry.write_snapshot(directory)
+            except Exception as e:
+                logging.getLogger(__name__).warning('Metrics snapshot failed: %s', e)
+            stop.wait(app.config['METRICS_SNAPSHOT_INTERVAL'])
+
+    thread = threading.Thread(target=loop, name='metrics-snapshot', daemon=True)
+    thread.start()
+    app.extensions['metrics_snapshot_writer'] = (thread, stop)
+
+
+def stop_snapshot_writer(app):
+    # Після повернення потік уже не перезапише <pid>.json поверх фінального знімка
+    writer = app.extensions.pop('metrics_snapshot_writer', None)
+    if writer is not None:
+        thread, stop = writer
+        stop.set()
+        thread.join()
+
+
+registry = MetricsRegistry()
+
+http_request_seconds = registry.histogram(
+    'employee_http_request_seconds', 'Request latency per route', ('method', 'route', 'status'))
+db_query_seconds = registry.histogram(
+    'employee_db_query_seconds', 'EmployeeDAO method latency', ('method',))
+db_query_rows = registry.histogram(
+    'employee_db_query_rows', 'Rows returned by EmployeeDAO methods', ('method',), buckets=ROW_BUCKETS)
+db_connection_acquire_seconds = registry.histogram(
+    'employee_db_connection_acquire_seconds', 'Time to get a connection from the pool')
+json_serialize_seconds = registry.histogram(
+    'employee_json_serialize_seconds', 'JSON encoding time of responses')
+db_slow_queries_total = registry.counter(
+    'employee_db_slow_queries_total', 'EmployeeDAO calls slower than SLOW_QUERY_THRESHOLD_MS', ('method',))
+
+
+# ----------------------------------------
+# Хуки для DAO
+# ----------------------------------------
+
+def _row_count(result):
+    # Список рядків або один рядок; кортежі (кілька значень) і скаляри — не рядки,
+    # для них кількість задає row_counts в instrument_dao
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, dict):
+        return 1
+    return None
+
+
+def _record_query(name, elapsed, rows):
+    db_query_seconds.observe(elapsed, method=name)
+    if rows is not None:
+        db_query_rows.observe(rows, method=name)
+    threshold_ms = current_app.config.get('SLOW_QUERY_THRESHOLD_MS')
+    if threshold_ms is not None and elapsed * 1000 >= threshold_ms:
+        db_slow_queries_total.inc(method=name)
+        slow_query_log.warning('Slow DAO call %s: %.1f ms (rows=%s)', name, elapsed * 1000, rows)
+
+
+def _iterate_timed(name, rows_iter, start):
+    # Для потокових методів час і рядки рахуються до кінця ітерації
+    rows = 0
+    try:
+        for row in rows_iter:
+            rows += 1
+            yield row
+    finally:
+        # Закриття обгортки (клієнт відключився) закриває і внутрішній генератор
+        rows_iter.close()
+        _record_query(name, time.perf_counter() - start, rows)
+
+
+def _instrument(name, func, row_count=_row_count):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        if inspect.isgenerator(result):
+            return _iterate_timed(name, result, start)
+        rows = row_count(result) if result is not None else None
+        _record_query(name, time.perf_counter() - start, rows)
+        return result
+    return wrapper
+
+
+def instrument_dao(cls, exclude=(), row_counts=None):
+    # Обгортає всі публічні методи DAO вимірюванням часу та кількості рядків.
+    # row_counts: {метод: func(result) -> кількість рядків} для методів, що повертають кортежі
+    row_counts = row_counts or {}
+    for name, func in list(vars(cls).items()):
+        if name.startswith('_') or name in exclude or not inspect.isfunction(func):
+            continue
+        setattr(cls, name, _instrument(name, func, row_counts.get(name, _row_count)))
+    return cls
+
+
+# ----------------------------------------
+# Хуки для маршрутів
+# ----------------------------------------
+
+def _start_timer():
+    g.request_started_at = time.perf_counter()
+
+
+def _observe_request(response):
+    started = g.pop('request_started_at', None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        http_request_seconds.observe(
+            time.perf_counter() - started, method=request.method, route=route, status=response.status_code)
+    return response
+
+
+def instrument_blueprint(bp):
+    bp.before_request(_start_timer)
+    bp.after_request(_observe_request)
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    # Підкласи змінюють кодування через _dumps(); час вимірюється тут
+
+    def dumps(self, obj, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._dumps(obj, **kwargs)
+        finally:
+            json_serialize_seconds.observe(time.perf_counter() - start)
+
+    def _dumps(self, obj, **kwargs):
+        return super().dumps(obj, **kwargs)
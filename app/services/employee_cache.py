@@ -0,0 +1,135 @@
+# app/services/employee_cache.py
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    import redis
+except ImportError:  # спільний бекенд опціональний
+    redis = None
+
+
+class LRUTTLCache:
+    # Локальний кеш процесу: обмежений розмір (LRU) + час життя запису (TTL)
+
+    def __init__(self, max_size=10000, ttl=60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return None
+            self._data.move_to_end(key)
+            self._stats['hits'] += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            result = dict(self._stats)
+            result.update({'backend': 'local', 'size': len(self._data), 'max_size': self.max_size})
+            return result
+
+
+class RedisCache:
+    # Спільний для всіх воркерів кеш: інвалідація в одному процесі одразу
+    # видна іншим. Значення зберігаються як JSON, TTL — на боці Redis.
+    # Витісненням керує сам Redis (maxmemory-policy), тому evictions тут не рахуються.
+
+    def __init__(self, url, ttl=60, prefix='employee:'):
+        if redis is None:
+            raise RuntimeError('EMPLOYEE_CACHE_BACKEND = "redis" requires the redis package')
+        self.ttl = ttl
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def get(self, key):
+        raw = self._client.get(self.prefix + str(key))
+        if raw is None:
+            self._count('misses')
+            return None
+        self._count('hits')
+        return json.loads(raw)
+
+    def set(self, key, value):
+        self._client.setex(self.prefix + str(key), self.ttl, json.dumps(value, default=str))
+
+    def delete(self, key):
+        self._client.delete(self.prefix + str(key))
+
+    def clear(self):
+        keys = list(self._client.scan_iter(match=self.prefix + '*'))
+        if keys:
+            self._client.delete(*keys)
+
+    def stats(self):
+        with self._lock:
+            result = dict(self._stats)
+        result.update({'backend': 'redis', 'size': None, 'max_size': None})
+        return result
+
+
+_registry_lock = threading.Lock()
+
+
+def get_employee_cache(app):
+    with _registry_lock:
+        cache = app.extensions.get('employee_cache')
+        if cache is None or cache.pid != os.getpid():
+            config = app.config
+            if config['EMPLOYEE_CACHE_BACKEND'] == 'redis':
+                cache = RedisCache(config['EMPLOYEE_CACHE_REDIS_URL'], ttl=config['EMPLOYEE_CACHE_TTL'])
+            else:
+                cache = LRUTTLCache(max_size=config['EMPLOYEE_CACHE_MAX_SIZE'], ttl=config['EMPLOYEE_CACHE_TTL'])
+            cache.pid = os.getpid()
+            app.extensions['employee_cache'] = cache
+        return cache
+
+
+def get_lookup_cache(app, name):
+    # Локальні кеші довідників (напр. ім'я працівника -> ID) для пакетних операцій.
+    # Застарілість між воркерами обмежена LOOKUP_CACHE_TTL.
+    with _registry_lock:
+        key = 'lookup_cache.' + name
+        cache = app.extensions.get(key)
+        if cache is None or cache.pid != os.getpid():
+            cache = LRUTTLCache(max_size=app.config['LOOKUP_CACHE_MAX_SIZE'], ttl=app.config['LOOKUP_CACHE_TTL'])
+            cache.pid = os.getpid()
+            app.extensions[key] = cache
+        return cache
@@ -1,6 +1,35 @@
 # app/services/employee_service.py
 
+import csv
+import gzip
+import io
+import json
+import os
+import re
+from datetime import datetime, timedelta
+from itertools import groupby
+
+from flask import current_app, g, has_request_context
+
+from app.admission import get_admission_gate
 from app.dao.employee_dao import EmployeeDAO 
+from app.services.employee_cache import get_employee_cache, get_lookup_cache
+from app.services.event_bus import get_event_bus
+from app.services.job_runner import get_job_runner
+from app.services.single_flight import get_single_flight
+
+EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+IMPORT_REQUIRED_FIELDS = ('first_name', 'last_name', 'email', 'department_id')
+
+# Поля DTO працівника -> колонки таблиці employees (для ?fields=)
+EMPLOYEE_FIELD_COLUMNS = {
+    'id': 'employee_id',
+    'firstName': 'first_name',
+    'lastName': 'last_name',
+    'email': 'email',
+    'departmentId': 'department_id',
+    'isItStaff': 'is_it_staff',
+}
 
 class EmployeeService:
     def __init__(self):
@@ -10,10 +39,10 @@ class EmployeeService:
     # I. DTO та Трансформація
     # ----------------------------------------
 
-    def _to_employee_dto(self, employee_data):
+    def _to_employee_dto(self, employee_data, fields=None):
         if not employee_data:
             return None
-        return {
+        dto = {
             'id': employee_data.get('employee_id'),
             'firstName': employee_data.get('first_name'),
             'lastName': employee_data.get('last_name'),
@@ -21,6 +50,9 @@ class EmployeeService:
             'departmentId': employee_data.get('department_id'),
             'isItStaff': bool(employee_data.get('is_it_staff'))
         }
+        if fields:
+            return {f: dto[f] for f in fields}
+        return dto
 
     # ----------------------------------------
     # II. EMPLOYEE CRUD ЛОГІКА
@@ -30,24 +62,191 @@ class EmployeeService:
         employees = self.dao.get_all_employees()
         return [self._to_employee_dto(e) for e in employees]
     
+    def get_all_employees_columnar(self):
+        # Рядки одразу у вигляді списків значень — без проміжного dict на кожен запис
+        employees = self.dao.get_all_employees()
+        return {
+            'columns': list(EMPLOYEE_FIELD_COLUMNS),
+            'rows': [
+                [e['employee_id'], e['first_name'], e['last_name'], e['email'], e['department_id'],
+                 bool(e['is_it_staff'])]
+                for e in employees
+            ],
+        }
+
+    def get_employees_page(self, after_id=None, limit=100, fields=None):
+        # employee_id потрібен завжди — він є курсором наступної сторінки
+        columns = ['employee_id'] + [EMPLOYEE_FIELD_COLUMNS[f] for f in fields or EMPLOYEE_FIELD_COLUMNS
+                                     if f != 'id']
+        rows = self.dao.get_employees_page(columns, after_id, limit)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return {
+            'items': [self._to_employee_dto(e, fields) for e in rows],
+            'nextCursor': str(rows[-1]['employee_id']) if has_more else None,
+        }
+    
+    def _cache(self):
+        return get_employee_cache(current_app)
+
+    def _publish(self, event_type, data):
+        get_event_bus(current_app).publish(event_type, data)
+
     def get_employee_by_id(self, employee_id):
-        employee = self.dao.get_employee_by_id(employee_id)
-        return self._to_employee_dto(employee)
+        # Read-through кеш перед DAO; записи інвалідуються методами запису нижче
+        cache = self._cache()
+        dto = cache.get(employee_id)
+        if dto is not None:
+            return dict(dto)
+        # Промах кешу читається з primary: рядок із репліки, що відстає, після
+        # інвалідації записом знову потрапив би в спільний кеш на весь TTL
+        employee = self.dao.get_employee_by_id(employee_id, use_primary=True)
+        dto = self._to_employee_dto(employee)
+        if dto is not None:
+            cache.set(employee_id, dto)
+        return dto
+
+    def _written_employee_row(self, employee_id, data):
+        # DTO будується із записаних значень, без повторного читання з БД;
+        # data — результат validate_employee_data, тож типи ті самі, що й у БД
+        return {
+            'employee_id': employee_id,
+            'first_name': data['first_name'],
+            'last_name': data['last_name'],
+            'email': data['email'],
+            'department_id': data['department_id'],
+            'is_it_staff': data.get('is_it_staff', False),
+        }
+
+    def get_employees_by_ids(self, employee_ids):
+        # Спочатку кеш, потім один пакетний запит для решти ID
+        cache = self._cache()
+        found = {}
+        misses = []
+        for employee_id in dict.fromkeys(employee_ids):
+            dto = cache.get(employee_id)
+            if dto is not None:
+                found[employee_id] = dict(dto)
+            else:
+                misses.append(employee_id)
+        if misses:
+            chunk_size = current_app.config['EMPLOYEE_IDS_CHUNK_SIZE']
+            for employee in self.dao.get_employees_by_ids(misses, chunk_size, use_primary=True):
+                dto = self._to_employee_dto(employee)
+                cache.set(dto['id'], dto)
+                found[dto['id']] = dto
+        return {
+            'employees': {str(employee_id): dto for employee_id, dto in found.items()},
+            'missing': [employee_id for employee_id in dict.fromkeys(employee_ids) if employee_id not in found],
+        }
+
+    # Дельта-синхронізація: токен "<version>" або "<version>.<employee_id>"
+    def parse_changes_token(self, token):
+        version, _, employee_id = (token or '0').partition('.')
+        return int(version), int(employee_id) if employee_id else None
+
+    def get_employee_changes(self, token, limit):
+        since_version, since_id = self.parse_changes_token(token)
+        current, upserts, deletes = self.dao.get_employee_changes(since_version, since_id, limit)
+
+        # Вставки/оновлення та видалення зливаються в один потік за (row_version, employee_id)
+        changes = sorted(
+            [(e['row_version'], e['employee_id'], e) for e in upserts] +
+            [(d['row_version'], d['employee_id'], None) for d in deletes],
+            key=lambda c: (c[0], c[1]))
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+
+        if has_more:
+            last_version, last_id, _ = changes[-1]
+            next_token = f'{last_version}.{last_id}'
+        else:
+            next_token = str(current)
+        return {
+            'upserts': [self._to_employee_dto(e) for _, _, e in changes if e is not None],
+            'deletes': [employee_id for _, employee_id, e in changes if e is None],
+            'nextToken': next_token,
+            'hasMore': has_more,
+        }
 
     def create_employee(self, data):
         new_id = self.dao.create_employee(data)
         if new_id:
-            return self.get_employee_by_id(new_id)
+            self._cache().delete(new_id)
+            self._invalidate_name_index()
+            dto = self._to_employee_dto(self._written_employee_row(new_id, data))
+            self._publish('employee.created', dto)
+            return dto
         return None
 
+    # Перевірка й приведення типів полів працівника (створення, оновлення, імпорт):
+    # у БД і у відповідь ідуть ті самі значення. Повертає (чисті дані, None) або (None, помилка)
+    def validate_employee_data(self, row):
+        if not isinstance(row, dict):
+            return None, 'Row must be an object'
+        missing = [k for k in IMPORT_REQUIRED_FIELDS if row.get(k) in (None, '')]
+        if missing:
+            return None, f'Missing required fields: {", ".join(missing)}'
+        email = str(row['email']).strip()
+        if not EMAIL_RE.match(email):
+            return None, f'Invalid email: {email}'
+        try:
+            department_id = int(row['department_id'])
+        except (TypeError, ValueError):
+            return None, f'Invalid department_id: {row["department_id"]}'
+        is_it_staff = row.get('is_it_staff', False)
+        if isinstance(is_it_staff, str):
+            is_it_staff = is_it_staff.strip().lower() in ('1', 'true', 'yes')
+        return {
+            'first_name': str(row['first_name']).strip(),
+            'last_name': str(row['last_name']).strip(),
+            'email': email,
+            'department_id': department_id,
+            'is_it_staff': bool(is_it_staff),
+        }, None
+
+    # Масовий імпорт: перевірка рядків до вставки, вставка чанками
+    def parse_import_csv(self, text):
+        return list(csv.DictReader(io.StringIO(text)))
+
+    def import_employees(self, rows):
+        valid_rows = []
+        errors = []
+        for index, row in enumerate(rows):
+            clean, error = self.validate_employee_data(row)
+            if error:
+                errors.append({'row': index, 'message': error})
+            else:
+                valid_rows.append((index, clean))
+
+        created = 0
+        if valid_rows:
+            chunk_size = current_app.config['EMPLOYEE_IMPORT_CHUNK_SIZE']
+            created, db_errors = self.dao.bulk_create_employees(valid_rows, chunk_size)
+            self._invalidate_name_index()
+            errors.extend({'row': index, 'message': message} for index, message in db_errors)
+
+        errors.sort(key=lambda e: e['row'])
+        return {'total': len(rows), 'created': created, 'failed': len(errors), 'errors': errors}
+
     def update_employee_data(self, employee_id, data):
+        # None — працівника не знайдено, False — помилка БД
         updated = self.dao.update_employee(employee_id, data)
+        self._cache().delete(employee_id)
+        self._invalidate_name_index()
         if updated:
-            return self.get_employee_by_id(employee_id)
-        return None
+            dto = self._to_employee_dto(self._written_employee_row(employee_id, data))
+            self._publish('employee.updated', dto)
+            return dto
+        return updated
     
     def delete_employee_by_id(self, employee_id):
-        return self.dao.delete_employee(employee_id)
+        result = self.dao.delete_employee(employee_id)
+        self._cache().delete(employee_id)
+        if result is True:
+            self._invalidate_name_index()
+            self._publish('employee.deleted', {'id': employee_id})
+        return result
 
     # ----------------------------------------
     # III. ЛОГІКА ГРУПУВАННЯ ТА ЗВІТІВ
@@ -60,24 +259,46 @@ class EmployeeService:
     def get_assignments_for_ticket_data(self, ticket_id):
         return self.dao.get_assignments_for_ticket(ticket_id)
 
+    def get_assignments_for_tickets_data(self, ticket_ids, per_ticket_limit):
+        grouped = {
+            str(ticket_id): {'assignments': [], 'total': 0, 'truncated': False}
+            for ticket_id in dict.fromkeys(ticket_ids)
+        }
+        for row in self.dao.get_assignments_for_tickets(list(dict.fromkeys(ticket_ids)), per_ticket_limit):
+            entry = grouped[str(row.pop('ticket_id'))]
+            entry['total'] = int(row.pop('total_count'))
+            entry['truncated'] = entry['total'] > per_ticket_limit
+            entry['assignments'].append(row)
+        return grouped
+
     # 2. Групування Звіту за Типом Обладнання
-    def _group_equipment_by_type(self, flat_report_list):
-        result_list = []
-        for item in flat_report_list:
-            type_name = item.get('type_name')
-            models_list = [m.strip() for m in item.get('models_used', '').split(',') if m.strip()]
-            
-            result_list.append({
-                'equipmentType': type_name,
-                'totalCount': int(item.get('total_count', 0)),
-                'inUseCount': int(item.get('in_use_count', 0)),
+    def _group_equipment_by_type(self, flat_report_rows):
+        # Рядки відсортовані за типом, тому групування йде потоково (itertools.groupby)
+        for _, rows in groupby(flat_report_rows, key=lambda r: r['equipment_type_id']):
+            first = next(rows)
+            models_list = [first['model']] if first.get('model') else []
+            models_list.extend(r['model'] for r in rows)
+            yield {
+                'equipmentType': first.get('type_name'),
+                'totalCount': int(first.get('total_count', 0)),
+                'inUseCount': int(first.get('in_use_count', 0)),
                 'models': models_list
-            })
-        return result_list
+            }
+
+    def _coalesced(self, key, func):
+        # Одночасні запити важких звітів виконують лише один запит до БД.
+        # Під @conditional до ключа входять версії таблиць з ETag: запит, що прочитав
+        # новішу версію, не приєднується до старішого виконання і не бере його результат.
+        versions = g.get('etag_versions') if has_request_context() else None
+        return get_single_flight(current_app).do((key, versions), func,
+                                                 ttl=current_app.config['SINGLE_FLIGHT_RESULT_TTL'])
 
     def get_equipment_report(self):
+        return self._coalesced('equipment_report', self._load_equipment_report)
+
+    def _load_equipment_report(self):
         flat_report = self.dao.get_equipment_count_by_type()
-        return self._group_equipment_by_type(flat_report)
+        return list(self._group_equipment_by_type(flat_report))
         
     # ----------------------------------------
     # IV. ЗАВДАННЯ ЛР №5
@@ -91,7 +312,10 @@ class EmployeeService:
 
     # 2.a. SP
     def create_equipment_type(self, name):
-        return self.dao.create_equipment_type_sp(name)
+        new_id = self.dao.create_equipment_type_sp(name)
+        if new_id is not None:
+            self._publish('equipment_type.created', {'id': new_id, 'name': name})
+        return new_id
 
 # app/services/employee_service.py (ДОДАТИ всередині класу EmployeeService)
 
@@ -104,18 +328,117 @@ class EmployeeService:
             data.get('role', 'resolver') # За замовчуванням 'resolver'
         )
 
+    # 2.b.ii. Пакетне призначення заявок
+    def _normalize_key(self, *values):
+        return tuple(str(v).strip().casefold() for v in values)
+
+    def _resolve_cached(self, cache_name, keys, fetch, row_key, row_id):
+        # keys -> [ID]; відсутні в кеші ключі шукаються одним пакетним запитом
+        cache = get_lookup_cache(current_app, cache_name)
+        resolved = {}
+        misses = []
+        for key in dict.fromkeys(keys):
+            ids = cache.get(self._normalize_key(*key))
+            if ids is None:
+                misses.append(key)
+            else:
+                resolved[key] = ids
+        if misses:
+            # У запит ідуть ті самі обрізані значення, що й у ключ кешу
+            found = {}
+            for row in fetch([tuple(str(v).strip() for v in key) for key in misses]):
+                found.setdefault(self._normalize_key(*row_key(row)), []).append(row_id(row))
+            for key in misses:
+                ids = found.get(self._normalize_key(*key), [])
+                # Порожній результат не кешується: запис може з'явитися пізніше
+                if ids:
+                    cache.set(self._normalize_key(*key), ids)
+                resolved[key] = ids
+        return resolved
+
+    def _invalidate_name_index(self):
+        get_lookup_cache(current_app, 'employee_names').clear()
+
+    def assign_tickets_batch(self, items):
+        report = [None] * len(items)
+        pending = []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict) or not all(
+                    item.get(k) for k in ('assignee_first_name', 'assignee_last_name', 'ticket_title')):
+                report[index] = {'index': index, 'status': 'invalid',
+                                 'message': 'Missing assignee_first_name, assignee_last_name or ticket_title'}
+            else:
+                pending.append(index)
+
+        employee_ids = self._resolve_cached(
+            'employee_names',
+            [(items[i]['assignee_first_name'], items[i]['assignee_last_name']) for i in pending],
+            self.dao.find_employee_ids_by_names,
+            lambda r: (r['first_name'], r['last_name']), lambda r: r['employee_id'])
+        ticket_ids = self._resolve_cached(
+            'ticket_titles',
+            [(items[i]['ticket_title'],) for i in pending],
+            lambda keys: self.dao.find_ticket_ids_by_titles([k[0] for k in keys]),
+            lambda r: (r['title'],), lambda r: r['ticket_id'])
+
+        to_insert = []
+        inserted_indexes = []
+        for index in pending:
+            item = items[index]
+            assignees = employee_ids[(item['assignee_first_name'], item['assignee_last_name'])]
+            tickets = ticket_ids[(item['ticket_title'],)]
+            problem = None
+            if not assignees:
+                problem = ('missing_employee', [])
+            elif len(assignees) > 1:
+                problem = ('ambiguous_employee', assignees)
+            elif not tickets:
+                problem = ('missing_ticket', [])
+            elif len(tickets) > 1:
+                problem = ('ambiguous_ticket', tickets)
+            if problem:
+                report[index] = {'index': index, 'status': problem[0], 'candidates': problem[1]}
+                continue
+            to_insert.append((tickets[0], assignees[0], item.get('role', 'resolver')))
+            inserted_indexes.append(index)
+            report[index] = {'index': index, 'status': 'assigned', 'ticketId': tickets[0], 'assigneeId': assignees[0]}
+
+        created = 0
+        if to_insert:
+            created = self.dao.bulk_create_ticket_assignments(to_insert)
+            if created is None:
+                return None
+        return {'total': len(items), 'assigned': created, 'failed': len(items) - len(inserted_indexes),
+                'items': report}
+
 # app/services/employee_service.py (ДОДАТИ всередині класу EmployeeService)
 
-    # 2.c. SP
-    def batch_insert_equipment_types(self, start_id):
-        # Передаємо стартовий ID. Ми можемо його жорстко задати тут, або прийняти від контролера.
-        # Для простоти передамо 4, оскільки поточний максимальний ID - 3.
-        return self.dao.batch_insert_equipment_types_sp(start_id)
+    # 2.c. Пакетне створення типів обладнання
+    def create_equipment_types_batch(self, names):
+        # Повтори в запиті відкидаються (перше написання); назви, рівні лише для колації БД
+        # (регістр, наголоси), зіставляє DAO. Наявні в БД назви не створюються повторно.
+        names = list(dict.fromkeys(names))
+        result = self.dao.bulk_create_equipment_types(names)
+        if result is None:
+            return None
+        created, existing = result
+        # Порядок відповіді — як у запиті (position — індекс запитаної назви)
+        created = [{'id': r['equipment_type_id'], 'name': r['name']}
+                   for r in sorted(created, key=lambda r: r['position'])]
+        existing = [{'id': r['equipment_type_id'], 'name': r['name']}
+                    for r in sorted(existing, key=lambda r: r['position'])]
+        if created:
+            # Одна подія на пакет замість тисяч equipment_type.created
+            self._publish('equipment_type.batch_created', {'ids': [item['id'] for item in created]})
+        return {'created': created, 'existing': existing}
 
 # app/services/employee_service.py (ДОДАТИ всередині класу EmployeeService)
 
     # 2.d. UDF + SP
     def get_ticket_priority_stats(self):
+        return self._coalesced('ticket_priority_stats', self._load_ticket_priority_stats)
+
+    def _load_ticket_priority_stats(self):
         stats = self.dao.get_ticket_priority_stats_sp()
         if stats:
             # Конвертуємо лише числові поля у float для JSON-серіалізації
@@ -133,17 +456,152 @@ class EmployeeService:
 # app/services/employee_service.py (ДОДАТИ всередині класу EmployeeService)
 
     # 2.e.i. SP з курсором
-    def split_equipment_log(self):
-        return self.dao.split_equipment_log_sp()
+    def _run_split_equipment_log(self, job):
+        result = self.dao.split_equipment_log_sp(on_progress=job.progress)
+        if not result or result['rows_moved'] is None:
+            raise RuntimeError('sp_split_equipment_log failed')
+        return {'rowsMoved': result['rows_moved'], 'createdTables': result['new_tables']}
+
+    def submit_split_equipment_log(self):
+        # Процедура довга, тому виконується у фоновому пулі; повертає (job, created)
+        app = current_app._get_current_object()
+        return get_job_runner(app).submit(app, 'split_equipment_log', self._run_split_equipment_log)
+
+    def get_job(self, job_id):
+        job = get_job_runner(current_app).get(job_id)
+        return job.to_dict() if job else None
 
 # app/services/employee_service.py (ДОДАТИ всередині класу EmployeeService)
 
     # 3.b. Кардинальність
     def delete_equipment_type_by_id(self, type_id):
-        return self.dao.delete_equipment_type(type_id)
+        result = self.dao.delete_equipment_type(type_id)
+        if isinstance(result, tuple):
+            _, log_entry = result
+            self._publish('equipment_type.deleted', {'id': type_id})
+            # Запис журналу створює тригер видалення — передаємо його підписникам
+            if log_entry:
+                self._publish('equipment_type_deletion_log.created', log_entry)
+            return True
+        return result
 
 # app/services/employee_service.py (ДОДАТИ всередині класу EmployeeService)
 
     # 3.c. Логування
     def get_equipment_type_deletion_logs(self):
-        return self.dao.get_equipment_type_deletion_logs()
\ No newline at end of file
+        return self.dao.get_equipment_type_deletion_logs()
+
+    def get_equipment_type_deletion_logs_page(self, before_id=None, after_id=None, since=None, until=None,
+                                              limit=100):
+        rows = self.dao.get_equipment_type_deletion_logs_page(before_id, after_id, since, until, limit)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if after_id is not None:
+            # Режим tail: курсор завжди є — останній побачений log_id для наступного опитування
+            next_cursor = str(rows[-1]['log_id'] if rows else after_id)
+        else:
+            next_cursor = str(rows[-1]['log_id']) if has_more else None
+        return {'items': rows, 'nextCursor': next_cursor, 'hasMore': has_more}
+
+    def _run_archive_deletion_logs(self, job, retention_days):
+        config = current_app.config
+        cutoff = datetime.now() - timedelta(days=retention_days)
+        total = self.dao.count_equipment_type_deletion_logs_before(cutoff)
+        if not total:
+            return {'rowsArchived': 0, 'archiveFile': None, 'cutoff': cutoff.isoformat()}
+
+        os.makedirs(config['DELETION_LOG_ARCHIVE_DIR'], exist_ok=True)
+        path = os.path.join(config['DELETION_LOG_ARCHIVE_DIR'], 'equipment_type_deletion_log-{}.ndjson.gz'.format(
+            datetime.now().strftime('%Y%m%dT%H%M%S')))
+        archived = 0
+
+        with gzip.open(path, 'wt', encoding='utf-8') as archive:
+            def write_rows(rows):
+                nonlocal archived
+                archive.writelines(self._ndjson_lines(rows))
+                # Архів скидається на диск до видалення частини з таблиці
+                archive.flush()
+                archived += len(rows)
+                job.progress('archiving', min(99, archived * 100 // total))
+
+            moved = self.dao.archive_equipment_type_deletion_logs(
+                cutoff, config['DELETION_LOG_ARCHIVE_CHUNK_SIZE'], write_rows)
+        return {'rowsArchived': moved, 'archiveFile': path, 'cutoff': cutoff.isoformat()}
+
+    def submit_archive_deletion_logs(self, retention_days=None):
+        # Фонове перенесення старих записів журналу в gzip NDJSON; повертає (job, created)
+        app = current_app._get_current_object()
+        if retention_days is None:
+            retention_days = app.config['DELETION_LOG_RETENTION_DAYS']
+        return get_job_runner(app).submit(
+            app, 'archive_equipment_type_deletion_log',
+            lambda job: self._run_archive_deletion_logs(job, retention_days))
+
+    # ----------------------------------------
+    # V. КОМПАКТНИЙ (КОЛОНКОВИЙ) ФОРМАТ
+    # ----------------------------------------
+
+    def to_columnar(self, items):
+        # [{"a": 1, "b": 2}, ...] -> {"columns": ["a", "b"], "rows": [[1, 2], ...]}
+        if not items:
+            return {'columns': [], 'rows': []}
+        columns = list(items[0].keys())
+        return {'columns': columns, 'rows': [[item.get(c) for c in columns] for item in items]}
+
+    # ----------------------------------------
+    # VI. ПОТОКОВИЙ ЕКСПОРТ (NDJSON / CSV)
+    # ----------------------------------------
+
+    def _ndjson_lines(self, items):
+        for item in items:
+            yield json.dumps(item, ensure_ascii=False, default=str) + '\n'
+
+    def _csv_lines(self, items):
+        buffer = io.StringIO()
+        writer = None
+        for item in items:
+            row = {k: '; '.join(map(str, v)) if isinstance(v, list) else v for k, v in item.items()}
+            if writer is None:
+                writer = csv.DictWriter(buffer, fieldnames=list(row.keys()))
+                writer.writeheader()
+            writer.writerow(row)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    def _export(self, items, fmt):
+        if fmt == 'csv':
+            return self._csv_lines(items)
+        return self._ndjson_lines(items)
+
+    def export_employees(self, fmt):
+        return self._export((self._to_employee_dto(e) for e in self.dao.iter_all_employees()), fmt)
+
+    def export_equipment_report(self, fmt):
+        return self._export(self._group_equipment_by_type(self.dao.iter_equipment_count_by_type()), fmt)
+
+    def export_equipment_type_deletion_logs(self, fmt):
+        return self._export(self.dao.iter_equipment_type_deletion_logs(), fmt)
+
+    # ----------------------------------------
+    # VII. ДІАГНОСТИКА
+    # ----------------------------------------
+
+    def get_table_versions(self, table_names):
+        return self.dao.get_table_versions(table_names)
+
+    # Підписка на події змін (SSE)
+    def subscribe_events(self, event_types=None):
+        return get_event_bus(current_app).subscribe(event_types)
+
+    def get_single_flight_stats(self):
+        return get_single_flight(current_app).stats()
+
+    def get_admission_stats(self):
+        return get_admission_gate(current_app).stats()
+
+    def get_pool_stats(self):
+        return self.dao.get_pool_stats()
+
+    def get_cache_stats(self):
+        return self._cache().stats()
@@ -0,0 +1,157 @@
+# app/services/event_bus.py
+
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+try:
+    import redis
+except ImportError:  # спільний бекенд опціональний
+    redis = None
+
+log = logging.getLogger(__name__)
+
+
+class Subscription:
+    # Буфер подій одного SSE-з'єднання. При переповненні найстаріші події
+    # відкидаються, а dropped повідомляє клієнту, що треба пересинхронізуватися.
+
+    def __init__(self, bus, event_types, buffer_size):
+        self.bus = bus
+        self.event_types = event_types
+        self._events = deque(maxlen=buffer_size)
+        self._cond = threading.Condition()
+        self.dropped = 0
+
+    def push(self, event):
+        if self.event_types and event['type'] not in self.event_types:
+            return
+        with self._cond:
+            if len(self._events) == self._events.maxlen:
+                self.dropped += 1
+            self._events.append(event)
+            self._cond.notify()
+
+    def wait(self, timeout):
+        # Повертає (події, кількість відкинутих) або ([], 0) після timeout
+        with self._cond:
+            if not self._events:
+                self._cond.wait(timeout)
+            events = list(self._events)
+            self._events.clear()
+            dropped, self.dropped = self.dropped, 0
+            return events, dropped
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+
+class EventBus:
+    # Локальний бекенд: події поширюються лише в межах одного процесу.
+    # Підходить для одного процесу (run.py); з кількома воркерами — RedisEventBus.
+
+    def __init__(self, buffer_size=100, max_subscribers=500):
+        self.buffer_size = buffer_size
+        self.max_subscribers = max_subscribers
+        self.pid = os.getpid()
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def subscribe(self, event_types=None):
+        # None, якщо досягнуто ліміту підписників
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                return None
+            subscription = Subscription(self, set(event_types or ()), self.buffer_size)
+            self._subscribers.add(subscription)
+            return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, event_type, data):
+        self._dispatch({'id': next(self._ids), 'type': event_type, 'data': data, 'time': time.time()})
+
+    def _dispatch(self, event):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription.push(event)
+
+    def stats(self):
+        with self._lock:
+            return {'subscribers': len(self._subscribers), 'max_subscribers': self.max_subscribers}
+
+
+class RedisEventBus(EventBus):
+    # Спільний бекенд: publish() надсилає подію в канал Redis, а кожен процес із
+    # SSE-клієнтами слухає канал і роздає події своїм підпискам. Тож клієнт бачить
+    # зміни, оброблені будь-яким воркером. ID подій — глобальний лічильник Redis.
+
+    def __init__(self, url, channel, buffer_size=100, max_subscribers=500):
+        if redis is None:
+            raise RuntimeError('EVENTS_BACKEND = "redis" requires the redis package')
+        super().__init__(buffer_size, max_subscribers)
+        self.channel = channel
+        self._client = redis.Redis.from_url(url)
+        self._listener = None
+
+    def subscribe(self, event_types=None):
+        # Канал слухає лише процес, у якого є SSE-клієнти
+        subscription = super().subscribe(event_types)
+        if subscription is not None:
+            with self._lock:
+                if self._listener is None:
+                    self._listener = threading.Thread(target=self._listen, name='event-bus', daemon=True)
+                    self._listener.start()
+        return subscription
+
+    def publish(self, event_type, data):
+        # Помилка Redis не повинна зривати запит, що вже записав зміни в БД
+        try:
+            event_id = self._client.incr(self.channel + ':seq')
+            event = {'id': event_id, 'type': event_type, 'data': data, 'time': time.time()}
+            self._client.publish(self.channel, json.dumps(event, default=str))
+        except redis.RedisError as e:
+            log.warning('Event publish failed: %s', e)
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    if message['type'] == 'message':
+                        self._dispatch(json.loads(message['data']))
+            except redis.RedisError as e:
+                log.warning('Event bus listener reconnecting: %s', e)
+                time.sleep(1)
+
+
+_registry_lock = threading.Lock()
+
+
+def get_event_bus(app):
+    with _registry_lock:
+        bus = app.extensions.get('event_bus')
+        if bus is None or bus.pid != os.getpid():
+            config = app.config
+            if config['EVENTS_BACKEND'] == 'redis':
+                bus = RedisEventBus(
+                    config['EVENTS_REDIS_URL'], config['EVENTS_REDIS_CHANNEL'],
+                    buffer_size=config['EVENTS_BUFFER_SIZE'],
+                    max_subscribers=config['EVENTS_MAX_SUBSCRIBERS'],
+                )
+            else:
+                bus = EventBus(
+                    buffer_size=config['EVENTS_BUFFER_SIZE'],
+                    max_subscribers=config['EVENTS_MAX_SUBSCRIBERS'],
+                )
+            app.extensions['event_bus'] = bus
+        return bus
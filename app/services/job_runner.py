@@ -0,0 +1,158 @@
+# app/services/job_runner.py
+
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from app.dao.job_dao import JobAlreadyActive, JobDAO
+
+
+class Job:
+
+    def __init__(self, kind, dao=None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = 'queued'
+        self.phase = 'queued'
+        self.percent = 0
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._dao = dao
+
+    @classmethod
+    def from_row(cls, row):
+        job = cls(row['kind'])
+        job.id = row['job_id']
+        job.status = row['status']
+        job.phase = row['phase']
+        job.percent = row['percent']
+        job.result = row['result']
+        job.error = row['error']
+        job.submitted_at = row['submitted_at']
+        job.started_at = row['started_at']
+        job.finished_at = row['finished_at']
+        return job
+
+    @property
+    def active(self):
+        return self.status in ('queued', 'running')
+
+    def progress(self, phase, percent):
+        self.phase = phase
+        self.percent = percent
+        if self._dao is not None:
+            self._dao.update_job(self.id, phase=phase, percent=percent)
+
+    def to_dict(self):
+        return {
+            'jobId': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'progress': {'phase': self.phase, 'percent': self.percent},
+            'result': self.result,
+            'error': self.error,
+            'submittedAt': self.submitted_at,
+            'startedAt': self.started_at,
+            'finishedAt': self.finished_at,
+        }
+
+
+class JobRunner:
+    # Обмежений пул фонових потоків для довгих процедур. Стан задач зберігається
+    # в таблиці background_jobs, тож статус видно з будь-якого воркера, а одночасно
+    # може виконуватися лише одна задача кожного виду (kind) на всі процеси.
+
+    def __init__(self, max_workers=2, history_size=100, queued_timeout=300):
+        self.history_size = history_size
+        self.queued_timeout = queued_timeout
+        self.pid = os.getpid()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._dao = JobDAO()
+
+    def _is_orphaned(self, row):
+        # Виконавець помер: running без утримуваного GET_LOCK або queued занадто довго
+        if row['status'] == 'running':
+            return not row['lock_held']
+        return time.time() - row['submitted_at'] > self.queued_timeout
+
+    def submit(self, app, kind, func):
+        # Повертає (job, True) для нової задачі або (активна задача, False) для дубліката
+        job = Job(kind, self._dao)
+        for _ in range(2):
+            try:
+                self._dao.create_job(job.id, kind, job.phase, job.submitted_at)
+                break
+            except JobAlreadyActive:
+                row = self._dao.get_active_job(kind)
+                if row is None:
+                    continue   # активна задача щойно завершилась
+                if not self._is_orphaned(row):
+                    return Job.from_row(row), False
+                self._dao.update_job(row['job_id'], status='failed', error='Worker process was lost',
+                                     finished_at=time.time(), finished=True)
+        else:
+            row = self._dao.get_active_job(kind)
+            if row is None:
+                raise RuntimeError('Could not submit job of kind %s' % kind)
+            return Job.from_row(row), False
+
+        self._dao.trim_history(self.history_size)
+        self._executor.submit(self._run, app, job, func)
+        return job, True
+
+    def _run(self, app, job, func):
+        with app.app_context():
+            lock_conn = self._dao.acquire_kind_lock(job.kind)
+            if lock_conn is None:
+                job.status = 'failed'
+                job.error = 'Another job of this kind is running'
+                job.finished_at = time.time()
+                self._dao.update_job(job.id, status=job.status, error=job.error, finished_at=job.finished_at,
+                                     finished=True)
+                return
+            try:
+                job.status = 'running'
+                job.started_at = time.time()
+                self._dao.update_job(job.id, status=job.status, started_at=job.started_at)
+                try:
+                    job.result = func(job)
+                    job.status = 'succeeded'
+                    job.phase, job.percent = 'done', 100
+                except Exception as e:
+                    job.status = 'failed'
+                    job.error = str(e)
+                job.finished_at = time.time()
+                self._dao.update_job(job.id, status=job.status, phase=job.phase, percent=job.percent,
+                                     result=job.result, error=job.error, finished_at=job.finished_at,
+                                     finished=True)
+            finally:
+                self._dao.release_kind_lock(lock_conn, job.kind)
+
+    def get(self, job_id):
+        row = self._dao.get_job(job_id)
+        return Job.from_row(row) if row else None
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+
+_registry_lock = threading.Lock()
+
+
+def get_job_runner(app):
+    # Потоки не переживають fork, тому кожен процес створює власний пул
+    with _registry_lock:
+        runner = app.extensions.get('job_runner')
+        if runner is None or runner.pid != os.getpid():
+            runner = JobRunner(
+                max_workers=app.config['JOB_RUNNER_WORKERS'],
+                history_size=app.config['JOB_RUNNER_HISTORY_SIZE'],
+                queued_timeout=app.config['JOB_QUEUED_TIMEOUT'],
+            )
+            app.extensions['job_runner'] = runner
+        return runner
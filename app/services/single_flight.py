@@ -0,0 +1,77 @@
+# app/services/single_flight.py
+
+import os
+import threading
+import time
+
+
+class _Call:
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    # Паралельні виклики з однаковим ключем чекають на одне виконання func().
+    # Успішний результат можна повторно віддавати ще ttl секунд.
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._results = {}
+        self._stats = {'executions': 0, 'shared': 0, 'reused': 0}
+
+    def do(self, key, func, ttl=0):
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None and cached[1] > time.monotonic():
+                self._stats['reused'] += 1
+                return cached[0]
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._stats['executions'] += 1
+            else:
+                self._stats['shared'] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                # None — ознака помилки в DAO, такий результат не зберігаємо
+                if ttl and call.error is None and call.result is not None:
+                    self._results[key] = (call.result, time.monotonic() + ttl)
+            call.done.set()
+
+    def stats(self):
+        with self._lock:
+            result = dict(self._stats)
+            result['in_flight'] = len(self._calls)
+            return result
+
+
+_registry_lock = threading.Lock()
+
+
+def get_single_flight(app):
+    with _registry_lock:
+        flight = app.extensions.get('single_flight')
+        if flight is None or flight.pid != os.getpid():
+            flight = SingleFlight()
+            app.extensions['single_flight'] = flight
+        return flight
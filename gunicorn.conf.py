@@ -0,0 +1,74 @@
+# gunicorn.conf.py
+#
+# Production-запуск:  gunicorn -c gunicorn.conf.py run:app
+# (run.py з app.run(debug=True) — лише для локальної розробки)
+# GET /api/employees/events (SSE) обслуговує окремий процес — див. gunicorn_events.conf.py
+
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# /metrics підсумовує знімки всіх воркерів із цього каталогу (див. app/metrics.py);
+# задається до імпорту Config, воркери успадковують змінну через fork
+_own_metrics_dir = not os.environ.get('METRICS_MULTIPROC_DIR')
+if _own_metrics_dir:
+    os.environ['METRICS_MULTIPROC_DIR'] = tempfile.mkdtemp(prefix='it_service_desk_metrics_')
+
+# SSE-з'єднання займає потік gthread-воркера на весь час підключення, тому тут їх
+# не більше восьмої частини потоків: половину забирають запити до БД, чверть — черга
+# контролю допуску (див. ADMISSION_* у app/config.py); основне SSE-навантаження —
+# gunicorn_events.conf.py
+os.environ.setdefault('EVENTS_MAX_SUBSCRIBERS', str(max(1, int(os.environ.get('WEB_THREADS', 16)) // 8)))
+
+from app import shutdown, warm_up  # noqa: E402
+from app.config import Config  # noqa: E402
+from app.metrics import registry  # noqa: E402
+
+bind = Config.WEB_BIND
+workers = Config.WEB_WORKERS
+threads = Config.WEB_THREADS
+worker_class = 'gthread'
+timeout = Config.WEB_TIMEOUT
+graceful_timeout = Config.WEB_GRACEFUL_TIMEOUT
+# Типове значення gunicorn; під нього розраховано EMPLOYEE_QUERY_MAX_IDS (GET ?ids=)
+limit_request_line = 4094
+
+# Застосунок імпортується один раз у master-процесі, воркери отримують його через fork
+preload_app = True
+
+
+def when_ready(server):
+    if workers > 1 and Config.EVENTS_BACKEND == 'local':
+        server.log.warning('EVENTS_BACKEND=local with %d workers: SSE clients only see changes '
+                           'handled by the worker they are connected to; set EVENTS_BACKEND=redis', workers)
+
+
+def post_worker_init(worker):
+    warm_up(worker.wsgi)
+
+
+def worker_exit(server, worker):
+    # Викликається після того, як воркер дочекався завершення поточних запитів
+    shutdown(worker.wsgi)
+
+
+def child_exit(server, worker):
+    # Виконується в master для кожного завершеного воркера, навіть убитого SIGKILL / OOM /
+    # за timeout, коли worker_exit не викликався: його знімок метрик стає мертвим
+    registry.reap(Config.METRICS_MULTIPROC_DIR, worker.pid)
+
+
+def on_starting(server):
+    # Знімки попереднього запуску з тим самим каталогом не повинні потрапити в суми
+    directory = Config.METRICS_MULTIPROC_DIR
+    for filename in os.listdir(directory):
+        if filename.endswith(('.json', '.tmp')):
+            os.remove(os.path.join(directory, filename))
+
+
+def on_exit(server):
+    if _own_metrics_dir:
+        shutil.rmtree(Config.METRICS_MULTIPROC_DIR, ignore_errors=True)
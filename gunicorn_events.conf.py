@@ -0,0 +1,37 @@
+# gunicorn_events.conf.py
+#
+# Окремий процес для GET /api/employees/events (Server-Sent Events):
+#   gunicorn -c gunicorn_events.conf.py run:app
+#
+# SSE-з'єднання відкрите весь час, поки відкрита панель. У gthread-воркері
+# (gunicorn.conf.py) кожне з них назавжди займає потік, тож кілька панелей
+# блокують звичайні запити. gevent-воркер тримає з'єднання в greenlet-ах,
+# тому тисячі неактивних підписників коштують лише пам'ять буферів.
+#
+# Reverse proxy має направляти /api/employees/events на EVENTS_BIND, решту — на
+# основний процес (без буферизації відповіді, напр. proxy_buffering off у nginx).
+# Потрібні пакет gevent і EVENTS_BACKEND=redis: зміни записують воркери основного
+# процесу, а сюди вони надходять через канал Redis.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault('EVENTS_MAX_SUBSCRIBERS', '5000')
+
+from app.config import Config  # noqa: E402
+
+bind = os.environ.get('EVENTS_BIND', '0.0.0.0:8001')
+workers = int(os.environ.get('EVENTS_WORKERS', 2))
+worker_class = 'gevent'
+worker_connections = Config.EVENTS_MAX_SUBSCRIBERS + 100
+# Тайм-аут gevent-воркера стосується лише зависання циклу подій, не тривалості SSE-з'єднань
+timeout = Config.WEB_TIMEOUT
+graceful_timeout = 5
+
+
+def when_ready(server):
+    if Config.EVENTS_BACKEND != 'redis':
+        server.log.warning('EVENTS_BACKEND is not "redis": this process will not see changes '
+                           'written by the main gunicorn workers')
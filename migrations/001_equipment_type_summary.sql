@@ -0,0 +1,93 @@
+-- migrations/001_equipment_type_summary.sql
+--
+-- Зведення для звіту GET /api/employees/equipment_by_type_report.
+-- Замість JOIN + GROUP BY + GROUP_CONCAT по всій таблиці equipment звіт
+-- читає дві невеликі таблиці, які тригери оновлюють при кожній зміні equipment:
+--   equipment_type_summary — кількість одиниць / in_use на тип;
+--   equipment_type_models  — окремі моделі типу з кількістю (без обрізання group_concat_max_len).
+--
+-- Застосування: mysql it_service_desk < migrations/001_equipment_type_summary.sql
+-- Заповнення (backfill) виконується в кінці; запускати без паралельних змін у equipment.
+
+CREATE TABLE IF NOT EXISTS equipment_type_summary (
+    equipment_type_id INT NOT NULL PRIMARY KEY,
+    total_count INT NOT NULL DEFAULT 0,
+    in_use_count INT NOT NULL DEFAULT 0,
+    INDEX idx_equipment_type_summary_total (total_count),
+    FOREIGN KEY (equipment_type_id) REFERENCES equipment_types (equipment_type_id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS equipment_type_models (
+    equipment_type_id INT NOT NULL,
+    model VARCHAR(255) NOT NULL,
+    model_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (equipment_type_id, model),
+    FOREIGN KEY (equipment_type_id) REFERENCES equipment_types (equipment_type_id) ON DELETE CASCADE
+);
+
+DROP PROCEDURE IF EXISTS sp_equipment_summary_apply;
+DROP TRIGGER IF EXISTS trg_equipment_summary_ai;
+DROP TRIGGER IF EXISTS trg_equipment_summary_au;
+DROP TRIGGER IF EXISTS trg_equipment_summary_ad;
+
+DELIMITER $$
+
+-- p_delta = +1 для доданого рядка, -1 для видаленого
+CREATE PROCEDURE sp_equipment_summary_apply(
+    IN p_type_id INT, IN p_model VARCHAR(255), IN p_status VARCHAR(50), IN p_delta INT)
+BEGIN
+    IF p_type_id IS NOT NULL THEN
+        INSERT INTO equipment_type_summary (equipment_type_id, total_count, in_use_count)
+        VALUES (p_type_id, p_delta, IF(p_status = 'in_use', p_delta, 0))
+        ON DUPLICATE KEY UPDATE
+            total_count = total_count + p_delta,
+            in_use_count = in_use_count + IF(p_status = 'in_use', p_delta, 0);
+        DELETE FROM equipment_type_summary
+        WHERE equipment_type_id = p_type_id AND total_count <= 0;
+
+        IF p_model IS NOT NULL AND p_model <> '' THEN
+            INSERT INTO equipment_type_models (equipment_type_id, model, model_count)
+            VALUES (p_type_id, p_model, p_delta)
+            ON DUPLICATE KEY UPDATE model_count = model_count + p_delta;
+            DELETE FROM equipment_type_models
+            WHERE equipment_type_id = p_type_id AND model = p_model AND model_count <= 0;
+        END IF;
+    END IF;
+END$$
+
+CREATE TRIGGER trg_equipment_summary_ai AFTER INSERT ON equipment
+FOR EACH ROW
+BEGIN
+    CALL sp_equipment_summary_apply(NEW.equipment_type_id, NEW.model, NEW.status, 1);
+END$$
+
+CREATE TRIGGER trg_equipment_summary_au AFTER UPDATE ON equipment
+FOR EACH ROW
+BEGIN
+    CALL sp_equipment_summary_apply(OLD.equipment_type_id, OLD.model, OLD.status, -1);
+    CALL sp_equipment_summary_apply(NEW.equipment_type_id, NEW.model, NEW.status, 1);
+END$$
+
+CREATE TRIGGER trg_equipment_summary_ad AFTER DELETE ON equipment
+FOR EACH ROW
+BEGIN
+    CALL sp_equipment_summary_apply(OLD.equipment_type_id, OLD.model, OLD.status, -1);
+END$$
+
+DELIMITER ;
+
+-- Backfill
+DELETE FROM equipment_type_models;
+DELETE FROM equipment_type_summary;
+
+INSERT INTO equipment_type_summary (equipment_type_id, total_count, in_use_count)
+SELECT equipment_type_id, COUNT(*), SUM(CASE WHEN status = 'in_use' THEN 1 ELSE 0 END)
+FROM equipment
+WHERE equipment_type_id IS NOT NULL
+GROUP BY equipment_type_id;
+
+INSERT INTO equipment_type_models (equipment_type_id, model, model_count)
+SELECT equipment_type_id, model, COUNT(*)
+FROM equipment
+WHERE equipment_type_id IS NOT NULL AND model IS NOT NULL AND model <> ''
+GROUP BY equipment_type_id, model;
@@ -0,0 +1,134 @@
+-- migrations/002_table_versions.sql
+--
+-- Лічильники версій таблиць для ETag / умовних GET.
+-- Кожна зміна таблиці збільшує її version, тому сервер може відповісти 304,
+-- прочитавши один рядок table_versions замість виконання всього звіту.
+--
+-- employees: версію збільшують методи запису EmployeeDAO в тій самій транзакції
+-- (див. EmployeeDAO._bump_table_version), записи в обхід DAO — тригери row_version
+-- з migrations/003_employee_change_log.sql. Решту таблиць змінюють збережені
+-- процедури та тригери, тому для них версію збільшують тригери нижче.
+--
+-- Застосування: mysql it_service_desk < migrations/002_table_versions.sql
+
+CREATE TABLE IF NOT EXISTS table_versions (
+    table_name VARCHAR(64) NOT NULL PRIMARY KEY,
+    version BIGINT UNSIGNED NOT NULL DEFAULT 0
+);
+
+INSERT IGNORE INTO table_versions (table_name, version) VALUES
+    ('employees', 0),
+    ('departments', 0),
+    ('equipment', 0),
+    ('equipment_types', 0),
+    ('equipment_type_deletion_log', 0),
+    ('ticket_assignments', 0);
+
+DELIMITER $$
+
+DROP TRIGGER IF EXISTS trg_departments_version_ai$$
+CREATE TRIGGER trg_departments_version_ai AFTER INSERT ON departments
+FOR EACH ROW
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'departments';
+END$$
+
+DROP TRIGGER IF EXISTS trg_departments_version_au$$
+CREATE TRIGGER trg_departments_version_au AFTER UPDATE ON departments
+FOR EACH ROW
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'departments';
+END$$
+
+DROP TRIGGER IF EXISTS trg_departments_version_ad$$
+CREATE TRIGGER trg_departments_version_ad AFTER DELETE ON departments
+FOR EACH ROW
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'departments';
+END$$
+
+DROP TRIGGER IF EXISTS trg_equipment_version_ai$$
+CREATE TRIGGER trg_equipment_version_ai AFTER INSERT ON equipment
+FOR EACH ROW
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'equipment';
+END$$
+
+DROP TRIGGER IF EXISTS trg_equipment_version_au$$
+CREATE TRIGGER trg_equipment_version_au AFTER UPDATE ON equipment
+FOR EACH ROW
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'equipment';
+END$$
+
+DROP TRIGGER IF EXISTS trg_equipment_version_ad$$
+CREATE TRIGGER trg_equipment_version_ad AFTER DELETE ON equipment
+FOR EACH ROW
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'equipment';
+END$$
+
+DROP TRIGGER IF EXISTS trg_equipment_types_version_ai$$
+CREATE TRIGGER trg_equipment_types_version_ai AFTER INSERT ON equipment_types
+FOR EACH ROW
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'equipment_types';
+END$$
+
+DROP TRIGGER IF EXISTS trg_equipment_types_version_au$$
+CREATE TRIGGER trg_equipment_types_version_au AFTER UPDATE ON equipment_types
+FOR EACH ROW
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'equipment_types';
+END$$
+
+DROP TRIGGER IF EXISTS trg_equipment_types_version_ad$$
+CREATE TRIGGER trg_equipment_types_version_ad AFTER DELETE ON equipment_types
+FOR EACH ROW
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'equipment_types';
+END$$
+
+DROP TRIGGER IF EXISTS trg_equipment_type_deletion_log_version_ai$$
+CREATE TRIGGER trg_equipment_type_deletion_log_version_ai AFTER INSERT ON equipment_type_deletion_log
+FOR EACH ROW
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'equipment_type_deletion_log';
+END$$
+
+DROP TRIGGER IF EXISTS trg_equipment_type_deletion_log_version_au$$
+CREATE TRIGGER trg_equipment_type_deletion_log_version_au AFTER UPDATE ON equipment_type_deletion_log
+FOR EACH ROW
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'equipment_type_deletion_log';
+END$$
+
+DROP TRIGGER IF EXISTS trg_equipment_type_deletion_log_version_ad$$
+CREATE TRIGGER trg_equipment_type_deletion_log_version_ad AFTER DELETE ON equipment_type_deletion_log
+FOR EACH ROW
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'equipment_type_deletion_log';
+END$$
+
+DROP TRIGGER IF EXISTS trg_ticket_assignments_version_ai$$
+CREATE TRIGGER trg_ticket_assignments_version_ai AFTER INSERT ON ticket_assignments
+FOR EACH ROW
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'ticket_assignments';
+END$$
+
+DROP TRIGGER IF EXISTS trg_ticket_assignments_version_au$$
+CREATE TRIGGER trg_ticket_assignments_version_au AFTER UPDATE ON ticket_assignments
+FOR EACH ROW
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'ticket_assignments';
+END$$
+
+DROP TRIGGER IF EXISTS trg_ticket_assignments_version_ad$$
+CREATE TRIGGER trg_ticket_assignments_version_ad AFTER DELETE ON ticket_assignments
+FOR EACH ROW
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = 'ticket_assignments';
+END$$
+
+DELIMITER ;
@@ -0,0 +1,63 @@
+-- migrations/003_employee_change_log.sql
+--
+-- Журнал змін employees для GET /api/employees/changes?since=<token>.
+--   employees.row_version  — версія table_versions('employees'), з якою рядок
+--                            востаннє записано. EmployeeDAO ставить одну версію на
+--                            транзакцію; для решти записів (інші програми, ручні
+--                            INSERT/UPDATE) її ставлять тригери BEFORE INSERT / UPDATE;
+--   employee_tombstones    — видалені працівники з версією видалення (заповнює тригер).
+--
+-- Потребує migrations/002_table_versions.sql.
+-- Застосування: mysql it_service_desk < migrations/003_employee_change_log.sql
+
+ALTER TABLE employees
+    ADD COLUMN row_version BIGINT UNSIGNED NOT NULL DEFAULT 0,
+    ADD INDEX idx_employees_row_version (row_version, employee_id);
+
+CREATE TABLE IF NOT EXISTS employee_tombstones (
+    employee_id INT NOT NULL PRIMARY KEY,
+    row_version BIGINT UNSIGNED NOT NULL,
+    deleted_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_employee_tombstones_row_version (row_version, employee_id)
+);
+
+-- Наявні рядки отримують одну спільну версію > 0, тож since=0 повертає всю таблицю
+UPDATE table_versions SET version = version + 1 WHERE table_name = 'employees';
+UPDATE employees
+SET row_version = (SELECT version FROM table_versions WHERE table_name = 'employees');
+
+DELIMITER $$
+
+-- Рядок без свіжої версії (row_version не задано або не змінено) отримує нову версію
+-- table_versions, інакше зміна не потрапить у /changes?since=
+DROP TRIGGER IF EXISTS trg_employees_row_version_bi$$
+CREATE TRIGGER trg_employees_row_version_bi BEFORE INSERT ON employees
+FOR EACH ROW
+BEGIN
+    IF NEW.row_version = 0 THEN
+        UPDATE table_versions SET version = LAST_INSERT_ID(version + 1) WHERE table_name = 'employees';
+        SET NEW.row_version = LAST_INSERT_ID();
+    END IF;
+END$$
+
+DROP TRIGGER IF EXISTS trg_employees_row_version_bu$$
+CREATE TRIGGER trg_employees_row_version_bu BEFORE UPDATE ON employees
+FOR EACH ROW
+BEGIN
+    IF NEW.row_version = OLD.row_version THEN
+        UPDATE table_versions SET version = LAST_INSERT_ID(version + 1) WHERE table_name = 'employees';
+        SET NEW.row_version = LAST_INSERT_ID();
+    END IF;
+END$$
+
+DROP TRIGGER IF EXISTS trg_employees_tombstone_ad$$
+CREATE TRIGGER trg_employees_tombstone_ad AFTER DELETE ON employees
+FOR EACH ROW
+BEGIN
+    UPDATE table_versions SET version = LAST_INSERT_ID(version + 1) WHERE table_name = 'employees';
+    INSERT INTO employee_tombstones (employee_id, row_version)
+    VALUES (OLD.employee_id, LAST_INSERT_ID())
+    ON DUPLICATE KEY UPDATE row_version = VALUES(row_version), deleted_at = CURRENT_TIMESTAMP;
+END$$
+
+DELIMITER ;
@@ -0,0 +1,10 @@
+-- migrations/004_deletion_log_time_index.sql
+--
+-- Індекс для журналу видалень типів обладнання:
+--   фільтри ?since= / ?until= у GET /api/employees/equipment_types/logs;
+--   вибірка старих записів архівуванням (POST /api/employees/equipment_types/logs/archive).
+--
+-- Застосування: mysql it_service_desk < migrations/004_deletion_log_time_index.sql
+
+ALTER TABLE equipment_type_deletion_log
+    ADD INDEX idx_equipment_type_deletion_log_time (deleted_at, log_id);
@@ -0,0 +1,27 @@
+-- migrations/005_background_jobs.sql
+--
+-- Спільний для всіх воркерів стан фонових задач (app/services/job_runner.py):
+-- GET /api/employees/jobs/<job_id> відповідає з будь-якого процесу.
+--   active_kind — вид задачі, поки вона queued/running, інакше NULL.
+--                 UNIQUE дозволяє лише одну активну задачу кожного виду на всі процеси
+--                 (кілька NULL унікальний індекс допускає).
+-- Задача під час виконання також тримає GET_LOCK('job:<kind>'): якщо процес помер,
+-- MySQL знімає блокування, і наступне подання позначає осиротілу задачу як failed.
+--
+-- Застосування: mysql it_service_desk < migrations/005_background_jobs.sql
+
+CREATE TABLE IF NOT EXISTS background_jobs (
+    job_id CHAR(32) NOT NULL PRIMARY KEY,
+    kind VARCHAR(64) NOT NULL,
+    active_kind VARCHAR(64) NULL,
+    status VARCHAR(16) NOT NULL,
+    phase VARCHAR(255) NOT NULL,
+    percent TINYINT UNSIGNED NOT NULL DEFAULT 0,
+    result TEXT NULL,
+    error TEXT NULL,
+    submitted_at DOUBLE NOT NULL,
+    started_at DOUBLE NULL,
+    finished_at DOUBLE NULL,
+    UNIQUE INDEX uq_background_jobs_active_kind (active_kind),
+    INDEX idx_background_jobs_submitted (submitted_at)
+);
@@ -0,0 +1,424 @@
+# tools/benchmark.py
+#
+# Навантажувальний тест маршрутів employee_bp.
+#
+# Запускає застосунок із create_app() у цьому ж процесі (багатопотоковий
+# werkzeug-сервер на випадковому порту), за потреби наповнює локальну MySQL
+# тестовими даними і проганяє кожен маршрут із фіксованою паралельністю.
+# Результат — JSON із пропускною здатністю та p50/p95/p99 для кожного маршруту,
+# який можна зберегти й порівняти між комітами.
+#
+# Потрібна локальна MySQL зі схемою it_service_desk; БД задається змінними
+# оточення MYSQL_HOST / MYSQL_USER / MYSQL_PASSWORD / MYSQL_DB (див. app/config.py).
+#
+#   python tools/benchmark.py --employees 100000 --equipment 100000 --concurrency 16 -o bench.json
+#   python tools/benchmark.py --no-seed --routes employees_list,employee_get
+#
+# --admission-check перевіряє контроль допуску: сервер обмежується WEB_THREADS потоками,
+# як gthread-воркер, і отримує вдвічі більше одночасних запитів важкого маршруту.
+# Очікується, що частина з них отримає швидкий 503 з Retry-After; якщо ні — код виходу 1.
+#
+#   python tools/benchmark.py --no-seed --admission-check --routes employees_export
+
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pymysql
+from werkzeug.serving import BaseWSGIServer, make_server
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+from app.config import Config  # noqa: E402
+
+SEED_CHUNK = 5000
+BENCH_EMAIL = 'bench.{}@example.com'
+
+
+# ----------------------------------------
+# I. Наповнення БД
+# ----------------------------------------
+
+def _connect():
+    return pymysql.connect(host=Config.MYSQL_HOST, user=Config.MYSQL_USER, password=Config.MYSQL_PASSWORD,
+                           db=Config.MYSQL_DB, cursorclass=pymysql.cursors.DictCursor)
+
+
+def _insert_chunked(conn, sql, rows):
+    with conn.cursor() as cursor:
+        for start in range(0, len(rows), SEED_CHUNK):
+            cursor.executemany(sql, rows[start:start + SEED_CHUNK])
+            conn.commit()
+
+
+def _insert_employees_versioned(conn, rows):
+    # Як EmployeeDAO: кожна частина отримує нову версію table_versions('employees')
+    # у тій самій транзакції, тож сценарій changes?since=0 і ETag бачать засіяні рядки
+    with conn.cursor() as cursor:
+        for start in range(0, len(rows), SEED_CHUNK):
+            cursor.execute(
+                "UPDATE table_versions SET version = LAST_INSERT_ID(version + 1) WHERE table_name = 'employees'")
+            version = cursor.lastrowid
+            cursor.executemany("""
+                INSERT INTO employees (first_name, last_name, email, department_id, is_it_staff, row_version)
+                VALUES (%s, %s, %s, %s, %s, %s)
+            """, [row + (version,) for row in rows[start:start + SEED_CHUNK]])
+            conn.commit()
+
+
+def seed(employees, equipment):
+    # Дозаповнює таблиці до потрібних обсягів; повторний запуск нічого не дублює
+    conn = _connect()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT department_id FROM departments")
+            department_ids = [r['department_id'] for r in cursor.fetchall()]
+            if not department_ids:
+                cursor.execute("INSERT INTO departments (name) VALUES ('Bench department')")
+                conn.commit()
+                department_ids = [cursor.lastrowid]
+
+            cursor.execute("SELECT COUNT(*) AS n FROM employees WHERE email LIKE 'bench.%%@example.com'")
+            existing = cursor.fetchone()['n']
+        rows = [
+            ('Bench', 'Employee{:07d}'.format(i), BENCH_EMAIL.format(i), random.choice(department_ids), i % 5 == 0)
+            for i in range(existing, employees)
+        ]
+        _insert_employees_versioned(conn, rows)
+
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT equipment_type_id FROM equipment_types")
+            type_ids = [r['equipment_type_id'] for r in cursor.fetchall()]
+            cursor.execute("SELECT COUNT(*) AS n FROM equipment")
+            existing = cursor.fetchone()['n']
+        if type_ids and existing < equipment:
+            rows = [
+                (random.choice(type_ids), 'Bench model {}'.format(i % 50), random.choice(('in_use', 'in_stock')))
+                for i in range(existing, equipment)
+            ]
+            try:
+                _insert_chunked(conn, """
+                    INSERT INTO equipment (equipment_type_id, model, status) VALUES (%s, %s, %s)
+                """, rows)
+            except pymysql.err.MySQLError as e:
+                conn.rollback()
+                print(f'Skipping equipment seed: {e}', file=sys.stderr)
+
+        return data_bounds(conn)
+    finally:
+        conn.close()
+
+
+def data_bounds(conn):
+    # Діапазон ID, з якого сценарії беруть випадкові записи
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT MIN(employee_id) AS lo, MAX(employee_id) AS hi FROM employees")
+        bounds = cursor.fetchone()
+        cursor.execute("SELECT MIN(department_id) AS department_id FROM departments")
+        department_id = cursor.fetchone()['department_id']
+    return {'min_id': bounds['lo'] or 1, 'max_id': bounds['hi'] or 1, 'department_id': department_id}
+
+
+# ----------------------------------------
+# II. Маршрути
+# ----------------------------------------
+
+# name -> (метод, шлях, тіло, чи змінює дані)
+def build_routes(ctx):
+    def random_id():
+        return random.randint(ctx['min_id'], ctx['max_id'])
+
+    counter = iter(range(10 ** 9))
+
+    def new_employee():
+        return {'first_name': 'Bench', 'last_name': 'Writer', 'email': 'bench.w{}.{}@example.com'.format(
+            os.getpid(), next(counter)), 'department_id': ctx['department_id'], 'is_it_staff': False}
+
+    return {
+        'employees_list': ('GET', lambda: '/api/employees/', None, False),
+        'employees_page': ('GET', lambda: '/api/employees/?limit=100&after={}'.format(random_id()), None, False),
+        'employees_batch': ('GET', lambda: '/api/employees/?ids=' + ','.join(
+            str(random_id()) for _ in range(100)), None, False),
+        'employees_batch_post': ('POST', lambda: '/api/employees/batch_get', lambda: {
+            'ids': [random_id() for _ in range(1000)]}, False),
+        'employee_get': ('GET', lambda: '/api/employees/{}'.format(random_id()), None, False),
+        'employee_create': ('POST', lambda: '/api/employees/', new_employee, True),
+        'employee_update': ('PUT', lambda: '/api/employees/{}'.format(ctx['max_id']), lambda: dict(
+            new_employee(), is_it_staff=True), True),
+        'employee_delete_missing': ('DELETE', lambda: '/api/employees/0', None, True),
+        'employees_bulk_import': ('POST', lambda: '/api/employees/bulk_import', lambda: [
+            new_employee() for _ in range(100)], True),
+        'employee_changes': ('GET', lambda: '/api/employees/changes?since=0&limit=500', None, False),
+        'employees_export': ('GET', lambda: '/api/employees/export', None, False),
+        'department_report': ('GET', lambda: '/api/employees/departments/{}'.format(ctx['department_id']),
+                              None, False),
+        'ticket_assignments': ('GET', lambda: '/api/employees/tickets/1/assignments', None, False),
+        'tickets_assignments_batch': ('GET', lambda: '/api/employees/tickets/assignments?ids=' + ','.join(
+            str(i) for i in range(1, 201)), None, False),
+        'equipment_report': ('GET', lambda: '/api/employees/equipment_by_type_report', None, False),
+        'equipment_report_export': ('GET', lambda: '/api/employees/equipment_by_type_report/export', None, False),
+        'ticket_priority_stats': ('GET', lambda: '/api/employees/ticket_priority_stats', None, False),
+        'equipment_type_logs': ('GET', lambda: '/api/employees/equipment_types/logs', None, False),
+        'equipment_type_logs_page': ('GET', lambda: '/api/employees/equipment_types/logs?limit=100', None, False),
+        'equipment_type_logs_tail': ('GET', lambda: '/api/employees/equipment_types/logs?after_log_id=0&limit=100',
+                                     None, False),
+        'equipment_type_logs_archive': ('POST', lambda: '/api/employees/equipment_types/logs/archive', None, True),
+        'equipment_type_logs_export': ('GET', lambda: '/api/employees/equipment_types/logs/export', None, False),
+        'specialization_create': ('POST', lambda: '/api/employees/specializations/', lambda: {
+            'name': 'Bench spec {}'.format(next(counter)), 'department_id': ctx['department_id']}, True),
+        'equipment_type_create': ('POST', lambda: '/api/employees/equipment_types/', lambda: {
+            'name': 'Bench type {}.{}'.format(os.getpid(), next(counter))}, True),
+        'equipment_type_delete_missing': ('DELETE', lambda: '/api/employees/equipment_types/0', None, True),
+        'ticket_assign': ('POST', lambda: '/api/employees/ticket_assignments/', lambda: {
+            'assignee_first_name': 'Bench', 'assignee_last_name': 'Employee0000000',
+            'ticket_title': 'Bench ticket'}, True),
+        'ticket_assign_batch': ('POST', lambda: '/api/employees/ticket_assignments/batch', lambda: [{
+            'assignee_first_name': 'Bench', 'assignee_last_name': 'Employee{:07d}'.format(i),
+            'ticket_title': 'Bench ticket'} for i in range(100)], True),
+        'equipment_types_batch_insert': ('POST', lambda: '/api/employees/equipment_types/batch_insert', lambda: {
+            'names': ['Bench batch type {}.{}'.format(os.getpid(), next(counter)) for _ in range(1000)]}, True),
+        'split_log_submit': ('POST', lambda: '/api/employees/equipment/split_log', None, True),
+        'job_status_missing': ('GET', lambda: '/api/employees/jobs/0', None, False),
+        'pool_stats': ('GET', lambda: '/api/employees/pool_stats', None, False),
+        'cache_stats': ('GET', lambda: '/api/employees/cache_stats', None, False),
+    }
+
+
+def uncovered_rules(app, routes):
+    # Маршрути employee_bp, для яких у build_routes немає сценарію
+    covered = set()
+    for _, path_fn, _, _ in routes.values():
+        path = path_fn().split('?')[0]
+        adapter = app.url_map.bind('localhost')
+        for method in ('GET', 'POST', 'PUT', 'DELETE'):
+            try:
+                endpoint, _ = adapter.match(path, method=method)
+                covered.add(endpoint)
+            except Exception:
+                pass
+    return sorted(
+        rule.rule for rule in app.url_map.iter_rules()
+        if rule.endpoint.startswith('employee.') and rule.endpoint not in covered
+    )
+
+
+# ----------------------------------------
+# III. Прогін
+# ----------------------------------------
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, int(round(p / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def run_route(port, route, requests_per_route, concurrency):
+    method, path_fn, body_fn, _ = route
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+    remaining = iter(range(requests_per_route))
+    remaining_lock = threading.Lock()
+
+    def worker():
+        nonlocal errors
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        local = []
+        local_errors = 0
+        while True:
+            with remaining_lock:
+                if next(remaining, None) is None:
+                    break
+            body = json.dumps(body_fn()) if body_fn else None
+            headers = {'Content-Type': 'application/json'} if body else {}
+            start = time.perf_counter()
+            try:
+                conn.request(method, path_fn(), body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                if response.status >= 500:
+                    local_errors += 1
+            except (OSError, http.client.HTTPException):
+                local_errors += 1
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+            local.append(time.perf_counter() - start)
+        conn.close()
+        with lock:
+            latencies.extend(local)
+            errors += local_errors
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    ms = lambda v: round(v * 1000, 3) if v is not None else None  # noqa: E731
+    return {
+        'method': method,
+        'requests': len(latencies),
+        'errors': errors,
+        'throughput_rps': round(len(latencies) / elapsed, 2) if elapsed else None,
+        'p50_ms': ms(percentile(latencies, 50)),
+        'p95_ms': ms(percentile(latencies, 95)),
+        'p99_ms': ms(percentile(latencies, 99)),
+    }
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    # Як gthread-воркер gunicorn: не більше threads запитів одночасно, решта з'єднань чекає
+
+    def __init__(self, host, port, app, threads):
+        super().__init__(host, port, app)
+        self._pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='web')
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._handle, request, client_address)
+
+    def _handle(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+
+def check_admission(app, route, requests_total):
+    # Насичує ворота допуску: 2 x WEB_THREADS одночасних запитів до сервера з WEB_THREADS потоками
+    config = app.config
+    threads = config['WEB_THREADS']
+    concurrency = threads * 2
+    method, path_fn, body_fn, _ = route
+    statuses = {}
+    retry_after = 0
+    lock = threading.Lock()
+
+    def one_request():
+        nonlocal retry_after
+        conn = http.client.HTTPConnection('127.0.0.1', server.server_port, timeout=60)
+        try:
+            body = json.dumps(body_fn()) if body_fn else None
+            conn.request(method, path_fn(), body=body,
+                         headers={'Content-Type': 'application/json'} if body else {})
+            response = conn.getresponse()
+            response.read()
+            status = response.status
+            has_retry_after = status == 503 and response.getheader('Retry-After') is not None
+        except (OSError, http.client.HTTPException):
+            status, has_retry_after = 'error', False
+        finally:
+            conn.close()
+        with lock:
+            statuses[status] = statuses.get(status, 0) + 1
+            retry_after += has_retry_after
+
+    server = PooledWSGIServer('127.0.0.1', 0, app, threads)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for _ in range(requests_total):
+                pool.submit(one_request)
+    finally:
+        server.shutdown()
+
+    return {
+        'threads': threads,
+        'max_concurrency': config['ADMISSION_MAX_CONCURRENCY'],
+        'max_queue': config['ADMISSION_MAX_QUEUE'],
+        'concurrency': concurrency,
+        'responses': {str(status): n for status, n in sorted(statuses.items(), key=str)},
+        'rejected_with_retry_after': retry_after,
+        'saturated': retry_after > 0,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark employee_bp routes')
+    parser.add_argument('--employees', type=int, default=10000, help='target number of employees to seed')
+    parser.add_argument('--equipment', type=int, default=10000, help='target number of equipment rows to seed')
+    parser.add_argument('--no-seed', action='store_true', help='use the database as is')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=500, help='requests per route')
+    parser.add_argument('--routes', help='comma-separated route names (default: all read routes)')
+    parser.add_argument('--include-writes', action='store_true', help='also run routes that modify data')
+    parser.add_argument('--admission-check', action='store_true',
+                        help='saturate the admission gate with the first selected route and expect 503s')
+    parser.add_argument('-o', '--output', help='write JSON results to this file')
+    args = parser.parse_args(argv)
+
+    if args.no_seed:
+        conn = _connect()
+        try:
+            ctx = data_bounds(conn)
+        finally:
+            conn.close()
+    else:
+        ctx = seed(args.employees, args.equipment)
+
+    app = create_app()
+    routes = build_routes(ctx)
+    for rule in uncovered_rules(app, routes):
+        print(f'WARNING: no benchmark scenario for {rule}', file=sys.stderr)
+
+    if args.routes:
+        selected = [name.strip() for name in args.routes.split(',')]
+        unknown = [name for name in selected if name not in routes]
+        if unknown:
+            parser.error('unknown routes: ' + ', '.join(unknown))
+    else:
+        selected = [name for name, route in routes.items() if args.include_writes or not route[3]]
+
+    if args.admission_check:
+        name = args.routes.split(',')[0].strip() if args.routes else 'employees_export'
+        result = check_admission(app, routes[name], args.requests)
+        print(json.dumps(dict(result, route=name), indent=2))
+        sys.exit(0 if result['saturated'] else 1)
+
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        results = {}
+        for name in selected:
+            results[name] = run_route(server.server_port, routes[name], args.requests, args.concurrency)
+            print(f'{name}: {results[name]}', file=sys.stderr)
+    finally:
+        server.shutdown()
+
+    report = {
+        'revision': git_revision(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'concurrency': args.concurrency,
+        'requests_per_route': args.requests,
+        'data': ctx,
+        'routes': results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
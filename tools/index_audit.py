@@ -0,0 +1,550 @@
+# tools/index_audit.py
+#
+# Аудит індексів під реальні запити EmployeeDAO.
+#
+# Збирає SQL з app/dao/employee_dao.py (розбір AST, без запуску застосунку),
+# виконує EXPLAIN кожного SELECT / UPDATE / DELETE на наповненій БД
+# (див. tools/benchmark.py) і позначає повні скани та filesort. Параметри підставляються
+# за типом колонки; необов'язкові фільтри "(%s IS NULL OR ...)" перевіряються в кожному
+# реальному поєднанні (напр. лише before, лише after, since + until), решта з них — NULL.
+# Окремо звіряє INDEX_PLAN з information_schema.STATISTICS; для позначених проблем,
+# яких не покриває ні наявний індекс, ні план, індекс виводиться з колонок
+# WHERE / JOIN / ORDER BY самого запиту. Для всіх відсутніх індексів генерується DDL.
+#
+# БД задається так само, як для застосунку (MYSQL_HOST / MYSQL_USER / ..., див. app/config.py).
+#
+#   python tools/index_audit.py                               # звіт + DDL
+#   python tools/index_audit.py --write-migration migrations/006_dao_indexes.sql
+#   python tools/index_audit.py --apply --check               # CI: застосувати й перевірити
+#
+# --check: код виходу 1, якщо лишилися відсутні індекси або неприйнятні
+# повні скани / filesort (ACCEPTED — свідомі винятки).
+
+import argparse
+import ast
+import json
+import os
+import re
+import sys
+from datetime import datetime, timedelta
+
+import pymysql
+import pymysql.cursors
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.config import Config  # noqa: E402
+
+DAO_PATH = os.path.join(ROOT, 'app', 'dao', 'employee_dao.py')
+DAO_CLASS = 'EmployeeDAO'
+EXECUTE_CALLS = ('execute', 'executemany', '_stream_query')
+
+# (таблиця, ім'я індексу, колонки, навіщо). Індекс вважається наявним, якщо
+# будь-який індекс таблиці починається з цих колонок (зокрема PRIMARY / FK).
+INDEX_PLAN = [
+    ('employees', 'idx_employees_department_last_name', ('department_id', 'last_name'),
+     'get_employees_by_department: WHERE department_id + ORDER BY last_name без filesort'),
+    ('employees', 'idx_employees_last_first_name', ('last_name', 'first_name'),
+     'find_employee_ids_by_names: пошук за парами (first_name, last_name)'),
+    ('ticket_assignments', 'idx_ticket_assignments_ticket_assigned', ('ticket_id', 'assigned_at', 'assignment_id'),
+     'get_assignments_for_ticket(s): WHERE ticket_id + ORDER BY assigned_at DESC'),
+    ('ticket_assignments', 'idx_ticket_assignments_assignee', ('assignee_id',),
+     'JOIN employees ON assignee_id'),
+    ('equipment', 'idx_equipment_type', ('equipment_type_id',),
+     'тригери equipment_type_summary і видалення типу обладнання'),
+    ('equipment_types', 'idx_equipment_types_name', ('name',),
+     'bulk_create_equipment_types: перевірка наявних назв WHERE name IN (...)'),
+    ('tickets', 'idx_tickets_title', ('title',),
+     'find_ticket_ids_by_titles: WHERE title IN (...)'),
+    ('equipment_type_deletion_log', 'idx_equipment_type_deletion_log_id', ('log_id',),
+     'журнал видалень: ORDER BY log_id DESC'),
+    ('equipment_type_deletion_log', 'idx_equipment_type_deletion_log_time', ('deleted_at', 'log_id'),
+     'журнал видалень: ?since= / ?until= та архівування за deleted_at'),
+]
+
+# Свідомі винятки: метод DAO -> типи проблем, які для нього очікувані
+ACCEPTED = {
+    'get_equipment_count_by_type': {'filesort'},     # сортування невеликої зведеної таблиці за total_count
+    'iter_equipment_count_by_type': {'filesort'},
+    'get_assignments_for_tickets': {'filesort'},     # віконні функції та фінальний ORDER BY ticket_id, rn
+}
+
+SQL_KEYWORDS = {'WHERE', 'ON', 'JOIN', 'LEFT', 'RIGHT', 'INNER', 'CROSS', 'ORDER', 'GROUP', 'LIMIT', 'SET',
+                'USING', 'FOR', 'STRAIGHT_JOIN'}
+MAX_DERIVED_COLUMNS = 4
+MAX_INDEX_NAME = 64
+
+# Префікс для індексів по TEXT/BLOB-колонках
+TEXT_PREFIX_LENGTH = 191
+EXPLAINABLE = ('SELECT', 'UPDATE', 'DELETE')
+INT_TYPES = ('tinyint', 'smallint', 'mediumint', 'int', 'bigint', 'decimal')
+TIME_TYPES = ('date', 'datetime', 'timestamp')
+
+
+# ----------------------------------------
+# I. Збір SQL з DAO
+# ----------------------------------------
+
+def _format_arg(node):
+    # ', '.join(['%s'] * n) -> '%s'; ', '.join(['(%s, %s)'] * n) -> '(%s, %s)';
+    # решта (напр. список колонок) -> '*'
+    if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == 'join'
+            and node.args and isinstance(node.args[0], ast.BinOp) and isinstance(node.args[0].left, ast.List)
+            and node.args[0].left.elts and isinstance(node.args[0].left.elts[0], ast.Constant)):
+        return node.args[0].left.elts[0].value
+    return '*'
+
+
+def _eval_sql(node, local_vars, class_consts):
+    # Відтворює текст запиту з констант, змінних методу, атрибутів класу,
+    # конкатенації та .format(); None — якщо вираз не статичний
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, ast.Name) and node.id in local_vars:
+        return _eval_sql(local_vars[node.id], local_vars, class_consts)
+    if (isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == 'self'
+            and node.attr in class_consts):
+        return class_consts[node.attr]
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+        left = _eval_sql(node.left, local_vars, class_consts)
+        right = _eval_sql(node.right, local_vars, class_consts)
+        return left + right if left is not None and right is not None else None
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == 'format':
+        base = _eval_sql(node.func.value, local_vars, class_consts)
+        return base.format(*[_format_arg(arg) for arg in node.args]) if base is not None else None
+    return None
+
+
+def collect_statements(path=DAO_PATH):
+    # Повертає [{'sql', 'methods'}] — кожен унікальний запит і методи, що його виконують
+    with open(path) as f:
+        tree = ast.parse(f.read(), filename=path)
+    cls = next(node for node in tree.body if isinstance(node, ast.ClassDef) and node.name == DAO_CLASS)
+
+    class_consts = {}
+    for node in cls.body:
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name)
+                and isinstance(node.value, ast.Constant) and isinstance(node.value.value, str)):
+            class_consts[node.targets[0].id] = node.value.value
+
+    statements = {}
+    for func in cls.body:
+        if not isinstance(func, ast.FunctionDef):
+            continue
+        local_vars = {}
+        for node in ast.walk(func):
+            if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+                local_vars[node.targets[0].id] = node.value
+        for node in ast.walk(func):
+            if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                    and node.func.attr in EXECUTE_CALLS and node.args):
+                continue
+            sql = _eval_sql(node.args[0], local_vars, class_consts)
+            passed_in = isinstance(node.args[0], ast.Name) and node.args[0].id in [a.arg for a in func.args.args]
+            if sql is None and passed_in:
+                continue   # допоміжний метод виконує SQL викликача — той збирається на місці виклику
+            if sql is None:
+                print(f'SKIPPED  {func.name}:{node.lineno} — SQL is built dynamically, not audited',
+                      file=sys.stderr)
+                continue
+            sql = ' '.join(sql.split())
+            methods = statements.setdefault(sql, [])
+            if func.name not in methods:
+                methods.append(func.name)
+    return [{'sql': sql, 'methods': methods} for sql, methods in statements.items()]
+
+
+# ----------------------------------------
+# II. EXPLAIN
+# ----------------------------------------
+
+def _connect():
+    return pymysql.connect(host=Config.MYSQL_HOST, user=Config.MYSQL_USER, password=Config.MYSQL_PASSWORD,
+                           db=Config.MYSQL_DB, cursorclass=pymysql.cursors.DictCursor)
+
+
+def _placeholders(sql, types):
+    # Опис кожного %s: LIMIT, захисна пара "(%s IS NULL OR колонка op %s)" або порівняння з колонкою
+    tables = set(_table_aliases(sql).values())
+    result = []
+    for match in re.finditer(r'%s', sql):
+        before, after = sql[:match.start()], sql[match.end():]
+        if re.search(r'\bLIMIT\s*$', before, re.I):
+            result.append({'kind': 'limit'})
+            continue
+        if re.match(r'\s*IS NULL\b', after, re.I):
+            result.append({'kind': 'guard'})
+            continue
+        compare = (re.search(r'(?:\w+\.)?(\w+)\s*(<=|>=|=|<|>)\s*$', before)
+                   or re.search(r'(?:\w+\.)?(\w+)\s+(IN)\s*\([^()]*$', before, re.I))
+        column, op = compare.groups() if compare else (None, '=')
+        column_type = next((types[(t, column)] for t in tables if (t, column) in types), None)
+        result.append({'kind': 'value', 'column': column, 'op': op.upper(), 'type': column_type})
+    # Захисний %s перевіряє той самий параметр, що й наступне порівняння
+    for index, item in enumerate(result[:-1]):
+        if item['kind'] == 'guard':
+            item.update(column=result[index + 1].get('column'), op=result[index + 1].get('op'))
+    return result
+
+
+def _sample_value(column_type, op):
+    # Правдоподібне значення для колонки: непорожній діапазон ID, останні 30 днів для часу;
+    # інші колонки — рядок '1' (MySQL порівнює його і з числами, і з рядками без втрати індексу)
+    if column_type in INT_TYPES:
+        return {'<': 2 ** 31 - 1, '<=': 2 ** 31 - 1, '>': 0, '>=': 0}.get(op, 1)
+    if column_type in TIME_TYPES:
+        now = datetime.now().replace(microsecond=0)
+        return now - timedelta(days=30) if op in ('>', '>=') else now
+    return '1'
+
+
+def _filter_variants(placeholders):
+    # Необов'язкові фільтри (захисні пари) перевіряються в реальних поєднаннях: кожен
+    # окремо та всі фільтри однієї колонки разом (since + until). [None] — фільтрів немає.
+    groups = {}
+    for index, item in enumerate(placeholders):
+        if item['kind'] == 'guard':
+            groups.setdefault(item['column'], []).append(index)
+    variants = []
+    for guards in groups.values():
+        variants.extend([guard] for guard in guards)
+        if len(guards) > 1:
+            variants.append(guards)
+    return variants or [None]
+
+
+def _sample_params(placeholders, active_guards=None):
+    # Незадіяні захисні пари отримують NULL в обидва %s, як від сервісу без фільтра
+    params = []
+    for index, item in enumerate(placeholders):
+        if item['kind'] == 'limit':
+            params.append(100)
+        elif item['kind'] == 'guard':
+            compare = placeholders[index + 1]
+            params.append(_sample_value(compare['type'], compare['op']) if index in active_guards else None)
+        elif index > 0 and placeholders[index - 1]['kind'] == 'guard':
+            params.append(_sample_value(item['type'], item['op']) if index - 1 in active_guards else None)
+        else:
+            params.append(_sample_value(item['type'], item['op']))
+    return params
+
+
+def _is_explainable(sql):
+    head = sql.lstrip('( ').upper()
+    return head.startswith(EXPLAINABLE) and not head.startswith('SELECT @')
+
+
+def explain(conn, statement, types):
+    sql = re.sub(r'\s+FOR UPDATE\s*$', '', statement['sql'], flags=re.I)
+    placeholders = _placeholders(sql, types)
+    plans, issues = [], []
+    for guards in _filter_variants(placeholders):
+        filters = None if guards is None else ' AND '.join(
+            '{} {}'.format(placeholders[g]['column'], placeholders[g]['op']) for g in guards)
+        with conn.cursor() as cursor:
+            cursor.execute('EXPLAIN ' + sql, _sample_params(placeholders, guards or ()))
+            plan = cursor.fetchall()
+        conn.rollback()
+        plans.append({'filters': filters, 'plan': plan})
+        for issue in _plan_issues(plan, has_where=bool(guards) or _has_fixed_where(sql)):
+            issues.append(dict(issue, filters=filters))
+
+    accepted = set.intersection(*[ACCEPTED.get(m, set()) for m in statement['methods']])
+    for issue in issues:
+        issue['accepted'] = issue['kind'] in accepted
+    return {'plans': plans, 'issues': issues}
+
+
+def _has_fixed_where(sql):
+    # WHERE, що лишається умовою і без необов'язкових фільтрів
+    where = re.search(r'\bWHERE\b(.*)', sql, re.I | re.S)
+    if not where:
+        return False
+    rest = re.sub(r'\(\s*%s IS NULL OR [^()]*\)', '', where.group(1), flags=re.I)
+    return bool(re.sub(r'\bAND\b', '', rest, flags=re.I).strip())
+
+
+def _plan_issues(plan, has_where):
+    issues = []
+    first_table = {}
+    for row in plan:
+        table = row.get('table') or ''
+        first_table.setdefault(row['id'], table)
+        if table.startswith('<'):
+            continue
+        # Повний скан таблиці з умовою або приєднаної таблиці (вкладений цикл без індексу);
+        # скан першої таблиці запиту без WHERE — це свідоме читання всієї таблиці
+        if row.get('type') == 'ALL' and (has_where or first_table[row['id']] != table):
+            issues.append({'kind': 'full_scan', 'table': table, 'rows': row.get('rows')})
+    for row in plan:
+        if 'filesort' in (row.get('Extra') or ''):
+            issues.append({'kind': 'filesort', 'table': row.get('table'), 'rows': row.get('rows')})
+    return issues
+
+
+# ----------------------------------------
+# III. Індекси
+# ----------------------------------------
+
+def existing_indexes(conn):
+    # {таблиця: [колонки індексу, ...]}
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT TABLE_NAME, INDEX_NAME, COLUMN_NAME
+            FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE()
+            ORDER BY TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX
+        """)
+        rows = cursor.fetchall()
+    indexes = {}
+    for row in rows:
+        indexes.setdefault(row['TABLE_NAME'], {}).setdefault(row['INDEX_NAME'], []).append(row['COLUMN_NAME'])
+    return {table: list(by_name.values()) for table, by_name in indexes.items()}
+
+
+def column_types(conn):
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT TABLE_NAME, COLUMN_NAME, DATA_TYPE
+            FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE()
+        """)
+        return {(row['TABLE_NAME'], row['COLUMN_NAME']): row['DATA_TYPE'].lower() for row in cursor.fetchall()}
+
+
+def _index_parts(table, columns, types):
+    return ['{}({})'.format(column, TEXT_PREFIX_LENGTH) if types[(table, column)].endswith(('text', 'blob'))
+            else column for column in columns]
+
+
+def _has_prefix(index_columns, columns):
+    return tuple(index_columns[:len(columns)]) == tuple(columns)
+
+
+def missing_indexes(indexes, types):
+    # Повертає (відсутні індекси плану, пропущені через відсутні таблиці/колонки)
+    missing, skipped = [], []
+    for table, name, columns, reason in INDEX_PLAN:
+        if any((table, column) not in types for column in columns):
+            skipped.append({'table': table, 'index': name, 'columns': list(columns)})
+            continue
+        if any(_has_prefix(existing, columns) for existing in indexes.get(table, [])):
+            continue
+        missing.append({'table': table, 'index': name, 'columns': _index_parts(table, columns, types),
+                        'reason': reason})
+    return missing, skipped
+
+
+def _table_aliases(sql):
+    # {аліас або назва: таблиця} з FROM / JOIN / UPDATE
+    aliases = {}
+    for match in re.finditer(r'\b(?:FROM|JOIN|UPDATE)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?', sql, re.I):
+        table, alias = match.group(1), match.group(2)
+        aliases[table] = table
+        if alias and alias.upper() not in SQL_KEYWORDS:
+            aliases[alias] = table
+    return aliases
+
+
+def derive_index_columns(sql, alias, types):
+    # Колонки індексу для таблиці з EXPLAIN: спершу рівність / IN / умова JOIN,
+    # далі ORDER BY (прибирає filesort), а без сортування — перша умова діапазону
+    aliases = _table_aliases(sql)
+    table = aliases.get(alias)
+    if table is None:
+        return None, ()
+
+    def own(qualifier, column):
+        return (table, column) in types and (qualifier is None or aliases.get(qualifier) == table)
+
+    body = re.split(r'\bFROM\b', sql, maxsplit=1, flags=re.I)[-1]
+    orders = re.findall(r'\bORDER BY\s+(.+?)(?=\bLIMIT\b|\bFOR\b|\)|$)', body, re.I)
+    predicates = re.sub(r'\bORDER BY\s+(.+?)(?=\bLIMIT\b|\bFOR\b|\)|$)', ' ', body, flags=re.I)
+    predicates = re.sub(r'\bSET\b.*?(?=\bWHERE\b|$)', ' ', predicates, flags=re.I)
+
+    # Рівність з параметром / IN, рівність з колонкою іншої таблиці (JOIN), діапазони, сортування
+    equality, joins, ranges, order = [], [], [], []
+    for columns in re.findall(r'\(([\w\s,.]+)\)\s*IN\b', predicates, re.I):
+        for ref in columns.split(','):
+            qualifier, _, column = ref.strip().rpartition('.')
+            if own(qualifier or None, column):
+                equality.append(column)
+    pattern = r'(?:\b(\w+)\.)?\b(\w+)\s*(<=|>=|=|<|>|\bIN\b)\s*(\w+\.\w+)?'
+    for qualifier, column, op, other in re.findall(pattern, predicates, re.I):
+        if not own(qualifier or None, column):
+            continue
+        if op == '=' and other:
+            joins.append(column)
+        elif op == '=' or op.upper() == 'IN':
+            equality.append(column)
+        else:
+            ranges.append(column)
+    for qualifier, column in re.findall(r'\b\w+\.\w+\s*=\s*\b(\w+)\.(\w+)', predicates):
+        if own(qualifier, column):
+            joins.append(column)
+    if orders:
+        for ref in orders[-1].split(','):
+            qualifier, _, column = ref.split()[0].rpartition('.') if ref.split() else ('', '', '')
+            if own(qualifier or None, column):
+                order.append(column)
+
+    # Колонка JOIN потрібна лише внутрішній таблиці з'єднання — тій, що не має власних умов
+    columns = list(dict.fromkeys(equality or joins))
+    columns += [c for c in dict.fromkeys(order or ranges[:1]) if c not in columns]
+    return table, tuple(columns[:MAX_DERIVED_COLUMNS])
+
+
+def derive_indexes(results, indexes, types, planned):
+    # Індекси для неприйнятих проблем, яких не покриває наявний індекс або INDEX_PLAN.
+    # issue['fix'] — ім'я індексу, що її усуває (None — автоматичного виправлення немає).
+    suggestions = {}
+    for result in results:
+        for issue in result.get('issues', []):
+            if issue['accepted']:
+                continue
+            issue['fix'] = None
+            table, columns = derive_index_columns(result['sql'], issue['table'] or '', types)
+            if not columns:
+                continue
+            plan = [(item['index'], item['columns']) for item in planned if item['table'] == table]
+            covering = next((name for name, cols in plan if _has_prefix(cols, columns)), None)
+            if covering:
+                issue['fix'] = covering
+                continue
+            if any(_has_prefix(existing, columns) for existing in indexes.get(table, [])):
+                continue   # індекс є, але оптимізатор його не бере — потрібен розбір вручну
+            name = 'idx_{}_{}'.format(table, '_'.join(columns))[:MAX_INDEX_NAME]
+            suggestions.setdefault((table, columns), {
+                'table': table, 'index': name, 'columns': _index_parts(table, columns, types),
+                'reason': 'виведено з запиту: {} у {}'.format(issue['kind'], ', '.join(result['methods'])),
+            })
+            issue['fix'] = name
+    return list(suggestions.values())
+
+
+def build_ddl(missing):
+    # Одна ALTER TABLE на таблицю — таблиця перебудовується один раз
+    by_table = {}
+    for item in missing:
+        by_table.setdefault(item['table'], []).append(item)
+    statements = []
+    for table, items in by_table.items():
+        clauses = ',\n'.join(
+            '    ADD INDEX {} ({})'.format(item['index'], ', '.join(item['columns'])) for item in items)
+        statements.append('ALTER TABLE {}\n{};'.format(table, clauses))
+    return statements
+
+
+def write_migration(path, missing, statements):
+    name = os.path.relpath(path, ROOT)
+    lines = [
+        '-- {}'.format(name),
+        '--',
+        '-- Індекси під запити EmployeeDAO (згенеровано tools/index_audit.py).',
+    ]
+    lines += ['--   {}.{} — {}'.format(item['table'], item['index'], item['reason']) for item in missing]
+    lines += [
+        '--',
+        '-- Застосування: mysql it_service_desk < {}'.format(name),
+        '',
+    ]
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines) + '\n' + '\n\n'.join(statements) + '\n')
+
+
+# ----------------------------------------
+# IV. Звіт
+# ----------------------------------------
+
+def audit(conn, statements):
+    indexes = existing_indexes(conn)
+    types = column_types(conn)
+    results = []
+    for statement in statements:
+        if not _is_explainable(statement['sql']):
+            results.append(dict(statement, skipped='not explainable (CALL / INSERT / session variable)'))
+            continue
+        try:
+            results.append(dict(statement, **explain(conn, statement, types)))
+        except pymysql.err.MySQLError as e:
+            conn.rollback()
+            results.append(dict(statement, error=str(e)))
+    missing, skipped = missing_indexes(indexes, types)
+    missing += derive_indexes(results, indexes, types, missing)
+    return {'statements': results, 'missing_indexes': missing, 'skipped_indexes': skipped}
+
+
+def print_report(report):
+    for result in report['statements']:
+        if 'skipped' in result:
+            continue
+        methods = ', '.join(result['methods'])
+        if 'error' in result:
+            print(f'ERROR    {methods}: {result["error"]}', file=sys.stderr)
+            continue
+        for issue in result['issues']:
+            status = 'accepted' if issue['accepted'] else 'FLAGGED '
+            fix = ''
+            if not issue['accepted']:
+                fix = f' -> {issue["fix"]}' if issue.get('fix') else ' -> no index fix derived'
+            filters = f' [{issue["filters"]}]' if issue.get('filters') else ''
+            print(f'{status} {issue["kind"]:<9} {issue["table"]} (~{issue["rows"]} rows) in {methods}{filters}{fix}',
+                  file=sys.stderr)
+    for item in report['missing_indexes']:
+        print(f'MISSING  {item["table"]}.{item["index"]} ({", ".join(item["columns"])}) — {item["reason"]}',
+              file=sys.stderr)
+    for item in report['skipped_indexes']:
+        print(f'SKIPPED  {item["table"]}.{item["index"]}: table or column not found', file=sys.stderr)
+
+
+def failures(report):
+    flagged = [issue for result in report['statements'] for issue in result.get('issues', [])
+               if not issue['accepted']]
+    errors = [result for result in report['statements'] if 'error' in result]
+    return len(flagged) + len(errors) + len(report['missing_indexes'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Audit indexes used by EmployeeDAO queries')
+    parser.add_argument('--check', action='store_true', help='exit with code 1 if any problem remains')
+    parser.add_argument('--apply', action='store_true', help='create missing indexes, then audit again')
+    parser.add_argument('--write-migration', metavar='PATH', help='write DDL for missing indexes to a migration file')
+    parser.add_argument('-o', '--output', help='write JSON report to this file')
+    args = parser.parse_args(argv)
+
+    statements = collect_statements()
+    conn = _connect()
+    try:
+        report = audit(conn, statements)
+        ddl = build_ddl(report['missing_indexes'])
+
+        if args.write_migration and ddl:
+            write_migration(args.write_migration, report['missing_indexes'], ddl)
+            print(f'Wrote {args.write_migration}', file=sys.stderr)
+
+        if args.apply and ddl:
+            with conn.cursor() as cursor:
+                for statement in ddl:
+                    print(f'Applying:\n{statement}', file=sys.stderr)
+                    cursor.execute(statement)
+            conn.commit()
+            report = audit(conn, statements)
+        elif ddl:
+            print('\n\n'.join(ddl))
+    finally:
+        conn.close()
+
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(json.dumps(report, indent=2, default=str) + '\n')
+
+    problems = failures(report)
+    print(f'{len(statements)} statements audited, {problems} problem(s)', file=sys.stderr)
+    if args.check and problems:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()